@@ -0,0 +1,110 @@
+"""
+Benchmarks every stage of turning a roster into a plot, against a local stand-in for Raider IO.
+
+Usage: ``python -m pytest benchmarks/bench_pipeline.py`` (requires ``pytest-benchmark``). Stages are measured for
+each of ``--roster-sizes`` characters (10 to 10,000 by default). The stub server's ``--stub-latency`` and
+``--stub-error-rate`` can be raised to see how fetching copes with a slow or flaky Raider IO. Results can be saved
+with ``--benchmark-autosave`` and later runs compared against them with ``--benchmark-compare`` to catch regressions.
+"""
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import pytest
+
+from io_comparison.decoding import load_roster
+from io_comparison.player_profile import ProfileHandler
+from io_comparison.plot import Plotter
+from io_comparison.plot_helper import generate_plot_helper
+from io_comparison.profile_table import ProfileTable
+from io_comparison.scheduler import RetryPolicy
+from sample_data import mock_io_data
+
+
+def _get_rounds(roster_size: int) -> int:
+    # Large rosters take seconds per stage, so fewer rounds are run to keep the suite practical.
+    return 5 if roster_size <= 1000 else 1
+
+
+def test_roster_load(benchmark, roster_files) -> None:
+
+    rosters = benchmark(lambda: [load_roster(fname) for fname in roster_files])
+    assert len(rosters) == len(roster_files)
+
+
+def test_fetch(benchmark, stub_io_server, rosters, roster_size) -> None:
+
+    # No rate limit and near instant retries, so this measures the handler and client rather than the waiting.
+    retry_policy = RetryPolicy(max_retries=10, backoff_base=0.001, backoff_max=0.01)
+    with ProfileHandler(base_url=stub_io_server.base_url, rate_limit=None, retry_policy=retry_policy) as handler:
+
+        def fetch():
+            return [profile for roster in rosters for profile in handler.generate_player_profiles(data=roster)]
+
+        profiles = benchmark.pedantic(fetch, rounds=_get_rounds(roster_size), iterations=1)
+
+    assert len(profiles) == roster_size
+    # There are no stats when benchmarking is disabled (e.g., ``--benchmark-disable`` to only check the suite runs).
+    if benchmark.stats is not None:
+        benchmark.extra_info["characters_per_second"] = roster_size / benchmark.stats.stats.mean
+
+
+def test_format(benchmark, entries) -> None:
+
+    handler = ProfileHandler()
+    io_results = mock_io_data()
+
+    profiles = benchmark(
+        lambda: [handler._format_io_results(io_results, class_, spec, entry) for class_, spec, entry in entries]
+    )
+    assert len(profiles) == len(entries)
+
+
+def test_plotter_init(benchmark) -> None:
+    benchmark(Plotter)
+
+
+def test_render(benchmark, profiles, roster_size) -> None:
+
+    # Building the artists and rasterizing them, without encoding or writing the image.
+    plotter = Plotter()
+    table = ProfileTable.from_profiles(profiles)
+
+    def render():
+        fig, _ = plotter._draw_figure(table)
+        fig.canvas.draw()
+        plt.close(fig)
+
+    benchmark.pedantic(render, rounds=_get_rounds(roster_size), iterations=1)
+
+
+def test_savefig(benchmark, profiles, roster_size, tmp_path) -> None:
+
+    plotter = Plotter(
+        plot_helper=generate_plot_helper(figsize=Plotter._FIGSIZE, output_path=str(tmp_path)), reuse_figures=False
+    )
+    table = ProfileTable.from_profiles(profiles)
+    output_file = plotter.get_output_file("benchmark")
+
+    def setup():
+        fig, _ = plotter._draw_figure(table)
+        return (fig, output_file), {}
+
+    benchmark.pedantic(plotter._save_figure, setup=setup, rounds=_get_rounds(roster_size), iterations=1)
+    assert tmp_path.joinpath("benchmark.png").exists()
+
+
+def test_render_from_template(benchmark, profiles, roster_size, tmp_path) -> None:
+
+    # Drawing only the profiles onto a reused figure template, then encoding and writing the image. Compare against
+    # ``test_render`` plus ``test_savefig``, which draw the whole figure.
+    plotter = Plotter(plot_helper=generate_plot_helper(figsize=Plotter._FIGSIZE, output_path=str(tmp_path)))
+    table = ProfileTable.from_profiles(profiles)
+    output_file = plotter.get_output_file("benchmark")
+    plotter._draw_from_template(table, None, output_file)
+
+    benchmark.pedantic(
+        plotter._draw_from_template, args=(table, None, output_file), rounds=_get_rounds(roster_size), iterations=1
+    )
+    assert tmp_path.joinpath("benchmark.png").exists()
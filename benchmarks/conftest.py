@@ -0,0 +1,136 @@
+import random
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+# The local Raider IO stand-in and mock responses are shared with the tests.
+sys.path.insert(0, str(Path(__file__).parents[1].joinpath("tests")))
+
+import io_comparison.settings as settings
+from io_comparison.decoding import Roster, RosterEntry, dumps
+from io_comparison.player_profile import Difficulty, Profile, Progression
+from stub_io_server import StubIOServer
+from sample_data import mock_io_data
+
+_DEFAULT_ROSTER_SIZES = "10,100,1000,10000"
+_REALMS = ["barthilas", "frostmourne", "kazzak", "tarren-mill", "draenor", "illidan", "area-52", "stormrage"]
+
+
+def pytest_addoption(parser) -> None:
+
+    group = parser.getgroup("io_comparison benchmarks")
+    group.addoption(
+        "--roster-sizes",
+        default=_DEFAULT_ROSTER_SIZES,
+        help=f"Comma separated numbers of characters to benchmark each stage with. Default: {_DEFAULT_ROSTER_SIZES}.",
+    )
+    group.addoption(
+        "--stub-latency", type=float, default=0.0, help="Seconds the stub server waits before answering each request."
+    )
+    group.addoption(
+        "--stub-error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests the stub server answers with a retryable 503.",
+    )
+
+
+def pytest_generate_tests(metafunc) -> None:
+
+    if "roster_size" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("--roster-sizes").split(",")]
+        metafunc.parametrize("roster_size", sizes, indirect=True)
+
+
+@pytest.fixture(scope="session")
+def roster_size(request) -> int:
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def stub_io_server(pytestconfig):
+
+    server = StubIOServer(
+        default_payload=mock_io_data(),
+        latency=pytestconfig.getoption("--stub-latency"),
+        error_rate=pytestconfig.getoption("--stub-error-rate"),
+        seed=1,
+    )
+    server.start()
+    yield server
+    server.stop()
+
+
+def generate_entries(number_characters: int) -> List[Tuple[str, str, RosterEntry]]:
+    """
+    Returns ``(class, spec, roster entry)`` for ``number_characters`` distinct characters, cycling through every spec.
+    """
+
+    rng = random.Random(1)
+    class_specs = [(class_, spec) for class_, specs in settings.CLASSES_SPECS.items() for spec in specs]
+
+    entries = []
+    for idx in range(number_characters):
+        class_, spec = class_specs[idx % len(class_specs)]
+        entry: RosterEntry = {
+            "player_handle": f"player{idx}",
+            "character_realm": rng.choice(_REALMS),
+            "character_name": f"character{idx}",
+            "region": rng.choice(["US", "EU"]),
+            "guild": "None",
+        }
+        entries.append((class_, spec, entry))
+    return entries
+
+
+def split_into_rosters(entries: List[Tuple[str, str, RosterEntry]]) -> List[Roster]:
+    """
+    A roster has at most one character per spec, so larger numbers of characters are spread over several rosters.
+    """
+
+    rosters: List[Roster] = []
+    for class_, spec, entry in entries:
+        if not rosters or spec in rosters[-1].get(class_, {}):
+            rosters.append({})
+        rosters[-1].setdefault(class_, {})[spec] = entry
+    return rosters
+
+
+@pytest.fixture(scope="session")
+def entries(roster_size) -> List[Tuple[str, str, RosterEntry]]:
+    return generate_entries(roster_size)
+
+
+@pytest.fixture(scope="session")
+def rosters(entries) -> List[Roster]:
+    return split_into_rosters(entries)
+
+
+@pytest.fixture(scope="session")
+def roster_files(rosters, tmp_path_factory) -> List[Path]:
+
+    directory = tmp_path_factory.mktemp("rosters")
+    fnames = []
+    for idx, roster in enumerate(rosters):
+        fname = directory.joinpath(f"roster_{idx}.json")
+        fname.write_text(dumps(roster))
+        fnames.append(fname)
+    return fnames
+
+
+@pytest.fixture(scope="session")
+def profiles(entries) -> List[Profile]:
+
+    rng = random.Random(1)
+    return [
+        Profile(
+            class_=class_,
+            spec=spec,
+            score=rng.uniform(0, settings.MAX_IO),
+            progression={settings.CURRENT_RAID: Progression(rng.randint(0, 10), 10, Difficulty.M)},
+            **entry,
+        )
+        for class_, spec, entry in entries
+    ]
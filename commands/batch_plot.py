@@ -0,0 +1,212 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from rich.console import Console
+from rich.table import Table
+
+import io_comparison.settings as settings
+from io_comparison.cache import DEFAULT_CACHE_PATH, ResponseCache
+from io_comparison.decoding import load_roster
+from io_comparison.fields import FieldSelection
+from io_comparison.icons import default_icon_names, get_icon_store, load_background
+from io_comparison.player_profile import DEFAULT_RATE_LIMIT, ProfileHandler
+from io_comparison.plot import Plotter
+from io_comparison.render_cache import DEFAULT_RENDER_CACHE_PATH, RenderCache
+
+console = Console()
+
+# Each worker process builds these once and reuses them for every roster it is handed.
+_handler: Optional[ProfileHandler] = None
+_plotter: Optional[Plotter] = None
+
+
+@dataclass
+class RosterTiming:
+    roster: str
+    number_characters: int
+    number_failed: int
+    fetch_time: float
+    render_time: float
+    output_file: str
+    error: Optional[str] = None  # Why the roster couldn't be plotted, if it couldn't.
+
+    @property
+    def total_time(self) -> float:
+        return self.fetch_time + self.render_time
+
+
+def _init_worker(
+    cache_path: str,
+    cache_ttl: float,
+    offline: bool,
+    rate_limit: float,
+    render_cache_path: Optional[str],
+    base_url: Optional[str],
+    reuse_figures: bool,
+) -> None:
+
+    global _handler, _plotter
+
+    # Every worker shares the same cache file, so a character fetched for one roster is served from the cache for the
+    # others.
+    cache = ResponseCache(cache_path, ttl=cache_ttl)
+    field_selection = FieldSelection(raids=(settings.CURRENT_RAID,))
+    _handler = ProfileHandler(
+        base_url=base_url, cache=cache, offline=offline, rate_limit=rate_limit, field_selection=field_selection
+    )
+    render_cache = None if render_cache_path is None else RenderCache(render_cache_path)
+    _plotter = Plotter(render_cache=render_cache, reuse_figures=reuse_figures)
+
+    # Warm the icon store so the first render doesn't pay for decoding.
+    icons = get_icon_store()
+    for name in default_icon_names():
+        icons[name]
+
+
+def _render_roster(fname: str, tag: str, background: Optional[str]) -> RosterTiming:
+
+    if background is None:
+        background = tag
+
+    start = time.perf_counter()
+    profiles = _handler.generate_player_profiles(data=load_roster(fname))
+    fetch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _plotter.plot_profiles(profiles, tag, load_background(background))
+    render_time = time.perf_counter() - start
+
+    output_file = _plotter.get_output_file(tag)
+    return RosterTiming(fname, len(profiles), _handler.summary.number_failed, fetch_time, render_time, output_file)
+
+
+def get_tags(fnames: Sequence[str]) -> List[str]:
+    """
+    Returns the tag (the file name without its extension) each roster's plot is saved under. Raises a ``ValueError``
+    if two rosters share a tag, as their plots would overwrite each other.
+    """
+
+    tags = [Path(fname).stem for fname in fnames]
+    duplicates = sorted({tag for tag in tags if tags.count(tag) > 1})
+    if duplicates:
+        raise ValueError(f"Rosters would be saved to the same plots: {', '.join(duplicates)}. Rename them.")
+    return tags
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(description="Plot the Raider IO scores of many rosters in parallel.")
+    parser.add_argument("rosters", nargs="+", help="Roster JSON files. Each is saved to a plot named after the file.")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="Number of rosters rendered at once (one per process)."
+    )
+    parser.add_argument(
+        "--background",
+        default=None,
+        help="Image tag used as the background of every plot. Defaults to the image named after each roster, if any.",
+    )
+    parser.add_argument(
+        "--cache", default=str(DEFAULT_CACHE_PATH), help="SQLite file used to cache Raider IO responses."
+    )
+    parser.add_argument(
+        "--cache-ttl", type=float, default=3600.0, help="Number of seconds a cached response is considered fresh for."
+    )
+    parser.add_argument(
+        "--offline", action="store_true", help="Render only from cached responses; never contact Raider IO."
+    )
+    parser.add_argument(
+        "--render-cache",
+        default=str(DEFAULT_RENDER_CACHE_PATH),
+        help="Directory of previous plots. A plot identical to a previous one is reused rather than re-rendered.",
+    )
+    parser.add_argument("--no-render-cache", action="store_true", help="Always re-render every plot.")
+    parser.add_argument(
+        "--no-reuse-figures",
+        action="store_true",
+        help="Draw the whole figure for every plot rather than reusing a rasterized template of its static parts. "
+        "Saves the memory each worker keeps the template in.",
+    )
+    parser.add_argument(
+        "--base-url", default=None, help="Raider IO character profile endpoint. Defaults to the public API."
+    )
+    return parser.parse_args(argv)
+
+
+def print_timings(timings: List[RosterTiming], wall_time: float) -> None:
+
+    number_rendered = sum(timing.error is None for timing in timings)
+    table = Table(title=f"Rendered {number_rendered} of {len(timings)} rosters in {wall_time:.2f}s")
+    table.add_column("Roster")
+    table.add_column("Characters", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Fetch (s)", justify="right")
+    table.add_column("Render (s)", justify="right")
+    table.add_column("Total (s)", justify="right")
+    table.add_column("Output")
+    table.add_column("Error")
+
+    for timing in timings:
+        table.add_row(
+            timing.roster,
+            str(timing.number_characters),
+            str(timing.number_failed),
+            f"{timing.fetch_time:.2f}",
+            f"{timing.render_time:.2f}",
+            f"{timing.total_time:.2f}",
+            timing.output_file,
+            "" if timing.error is None else f"[bold red]{timing.error}[/]",
+        )
+
+    console.print(table)
+
+
+def run(args: argparse.Namespace) -> List[RosterTiming]:
+
+    tags = get_tags(args.rosters)
+    workers = max(1, min(args.workers, len(args.rosters)))
+
+    # The Raider IO rate limit applies to us as a whole, so split it between the worker processes.
+    rate_limit = DEFAULT_RATE_LIMIT / workers
+
+    timings: List[RosterTiming] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(
+            args.cache,
+            args.cache_ttl,
+            args.offline,
+            rate_limit,
+            None if args.no_render_cache else args.render_cache,
+            args.base_url,
+            not args.no_reuse_figures,
+        ),
+    ) as executor:
+        futures = [
+            executor.submit(_render_roster, fname, tag, args.background) for fname, tag in zip(args.rosters, tags)
+        ]
+
+        # Collected in submission order so the table follows the order the rosters were given. A roster that can't be
+        # plotted (e.g., a malformed roster file) is reported alongside the others rather than aborting the batch.
+        for fname, future in zip(args.rosters, futures):
+            try:
+                timings.append(future.result())
+            except Exception as err:
+                timings.append(RosterTiming(fname, 0, 0, 0.0, 0.0, "", error=f"{type(err).__name__}: {err}"))
+
+    return timings
+
+
+if __name__ == "__main__":
+
+    start = time.perf_counter()
+    timings = run(parse_args())
+    print_timings(timings, time.perf_counter() - start)
+    if any(timing.error is not None for timing in timings):
+        sys.exit(1)
@@ -0,0 +1,12 @@
+from rich.console import Console
+
+from io_comparison.icons import ICON_ATLAS_PATH, IconStore
+
+console = Console()
+
+
+if __name__ == "__main__":
+
+    # Always decode from the image files so a stale atlas is never packed into a new one.
+    atlas_path = IconStore().build_atlas(ICON_ATLAS_PATH)
+    console.print(f"Saved icon atlas to [bold magenta]{atlas_path}[/]")
@@ -1,35 +1,26 @@
-import json
+import argparse
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-import matplotlib.image as mpimg
 from rich.console import Console
-
+from rich.table import Table
+
+import io_comparison.settings as settings
+from io_comparison.cache import DEFAULT_CACHE_PATH, ResponseCache
+from io_comparison.decoding import Roster, load_roster
+from io_comparison.fields import FieldSelection
+from io_comparison.icons import load_background
+from io_comparison.instrumentation import NULL_INSTRUMENTATION, Instrumentation, profile_to
 from io_comparison.player_profile import ProfileHandler
-from io_comparison.plot import Plotter
+from io_comparison.refresh import RefreshState
+from io_comparison.render_cache import DEFAULT_RENDER_CACHE_PATH, RenderCache
 
 console = Console()
 
 
-def get_data(fname: str) -> Dict[str, Any]:
-    with open(fname, "r") as f_in:
-        data = json.load(f_in)
-    return data
-
-def get_image(tag: str):
-
-
-    for image_format in ["png", "jpg"]:
-        fname = Path(__file__).parent.joinpath(f"../data/icons/{tag}.{image_format}")
-
-        try:
-            image = mpimg.imread(fname)
-        except FileNotFoundError:
-            continue
-        else:
-            break
-
-    return image
+def get_data(fname: str) -> Roster:
+    return load_roster(fname)
 
 def get_data_fname() -> Tuple[str, str, Optional[Any]]:
     tag = console.input(
@@ -42,11 +33,11 @@ def get_data_fname() -> Tuple[str, str, Optional[Any]]:
     if tag == "wowhead":
         fname = Path(__file__).parent.joinpath("../data/wowhead.json")
         tag = "wowhead"
-        extra_image = get_image("wowhead")
+        extra_image = load_background("wowhead")
     elif tag == "icy":
         fname = Path(__file__).parent.joinpath("../data/icy_veins.json")
         tag = "icy"
-        extra_image = get_image("icy_veins")
+        extra_image = load_background("icy_veins")
     else:
         fname = tag
         tag = "user"
@@ -55,13 +46,136 @@ def get_data_fname() -> Tuple[str, str, Optional[Any]]:
     return fname, tag, extra_image
 
 
-if __name__ == "__main__":
+def parse_args() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(description="Plot the Raider IO scores of a roster of characters.")
+    parser.add_argument(
+        "--cache", default=str(DEFAULT_CACHE_PATH), help="SQLite file used to cache Raider IO responses."
+    )
+    parser.add_argument(
+        "--cache-ttl", type=float, default=3600.0, help="Number of seconds a cached response is considered fresh for."
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch from Raider IO.")
+    parser.add_argument(
+        "--offline", action="store_true", help="Render only from cached responses; never contact Raider IO."
+    )
+    parser.add_argument(
+        "--incremental",
+        metavar="STATE_FILE",
+        default=None,
+        help="JSON file tracking each character between runs. Only re-crawled characters are refetched. A plot that "
+        "is unchanged as a result is reused from the render cache.",
+    )
+    parser.add_argument(
+        "--render-cache",
+        default=str(DEFAULT_RENDER_CACHE_PATH),
+        help="Directory of previous plots. A plot identical to a previous one is reused rather than re-rendered.",
+    )
+    parser.add_argument("--no-render-cache", action="store_true", help="Always re-render the plot.")
+    parser.add_argument(
+        "--no-reuse-figures",
+        action="store_true",
+        help="Draw the whole figure for every plot rather than reusing a rasterized template of its static parts.",
+    )
+    parser.add_argument(
+        "--import-dump",
+        metavar="DUMP_FILE",
+        default=None,
+        help="NDJSON file of Raider IO character profiles (one per line) to read the roster from instead of fetching "
+        "it. Raider IO is never contacted.",
+    )
+    parser.add_argument(
+        "--timings", action="store_true", help="Print how long each stage took along with cache and retry counts."
+    )
+    parser.add_argument(
+        "--timings-report", metavar="REPORT_FILE", default=None, help="Write the timings of each stage to a JSON file."
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PROFILE_FILE",
+        default=None,
+        help="Profile the run. Writes pyinstrument HTML if the file ends in .html, and cProfile stats otherwise.",
+    )
+    return parser.parse_args()
 
-    handler = ProfileHandler()
+
+def print_timings(report: Dict[str, Any]) -> None:
+
+    table = Table(title="Timings (ms)")
+    table.add_column("Stage", no_wrap=True)
+    table.add_column("Count", justify="right")
+    for column in ["Total", "Mean", "p50", "p90", "p99", "Max"]:
+        table.add_column(column, justify="right")
+
+    for name, span in report["spans"].items():
+        table.add_row(
+            name,
+            str(span["count"]),
+            *[f"{1000 * span[key]:.1f}" for key in ["total", "mean", "p50", "p90", "p99", "max"]],
+        )
+    console.print(table)
+
+    if report["counters"]:
+        counters = Table(title="Counters")
+        counters.add_column("Counter")
+        counters.add_column("Value", justify="right")
+        for name, value in report["counters"].items():
+            counters.add_row(name, str(value))
+        console.print(counters)
+
+
+def run(args: argparse.Namespace, instrumentation: Instrumentation) -> None:
+
+    if args.offline and args.no_cache:
+        raise ValueError("`--offline` requires the cache; it cannot be combined with `--no-cache`.")
+
+    cache = None if args.no_cache else ResponseCache(args.cache, ttl=args.cache_ttl)
     fname, tag, extra_image = get_data_fname()
 
-    data = get_data(fname)
-    profiles = handler.generate_player_profiles(data=data)
+    with instrumentation.span("roster.load"):
+        data = get_data(fname)
+    refresh_state = None if args.incremental is None else RefreshState(args.incremental)
+    # Only the current raid is plotted, so that's the only progression fetched and cached.
+    field_selection = FieldSelection(raids=(settings.CURRENT_RAID,))
+    with ProfileHandler(
+        cache=cache,
+        offline=args.offline,
+        refresh_state=refresh_state,
+        field_selection=field_selection,
+        instrumentation=instrumentation,
+    ) as handler:
+        if args.import_dump is None:
+            profiles = handler.generate_player_profiles(data=data)
+        else:
+            profiles = handler.import_player_profiles(args.import_dump, data=data)
+
+    # The plotting stack is slow to import, so it's only loaded once there is something to plot.
+    from io_comparison.plot import Plotter
 
-    plotter = Plotter()
+    render_cache = None if args.no_render_cache else RenderCache(args.render_cache)
+    plotter = Plotter(
+        render_cache=render_cache, instrumentation=instrumentation, reuse_figures=not args.no_reuse_figures
+    )
+
+    # Even when no character changed, the roster or background may have. The render cache key covers everything that
+    # is drawn, so it (rather than the refresh state) decides whether the plot needs re-rendering.
     plotter.plot_profiles(profiles, tag, extra_image)
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+
+    # Nothing is recorded unless the timings are asked for.
+    instrumentation = NULL_INSTRUMENTATION
+    if args.timings or args.timings_report is not None:
+        instrumentation = Instrumentation()
+
+    with nullcontext() if args.profile is None else profile_to(args.profile):
+        run(args, instrumentation)
+
+    if args.timings:
+        print_timings(instrumentation.report())
+    if args.timings_report is not None:
+        instrumentation.save_report(args.timings_report)
+        console.print(f"Saved timings to [bold magenta]{args.timings_report}[/]")
@@ -0,0 +1,19 @@
+import os
+import sys
+
+
+def use_default_backend() -> None:
+    """
+    Selects matplotlib's non-interactive Agg backend, unless a backend has already been chosen (through
+    ``MPLBACKEND`` or by importing ``pyplot``).
+
+    Plots are only ever written to file, so there is no need for matplotlib to search for (and import) a GUI toolkit.
+    Must be called before ``matplotlib.pyplot`` is imported to have any effect.
+    """
+
+    if "matplotlib.pyplot" in sys.modules or os.environ.get("MPLBACKEND"):
+        return
+
+    import matplotlib
+
+    matplotlib.use("Agg")
@@ -0,0 +1,145 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from io_comparison.decoding import dumps, loads
+
+DEFAULT_CACHE_PATH = Path.home().joinpath(".cache/io_comparison/responses.sqlite")
+
+
+class CacheMissError(KeyError):
+    """Raised when a response is required to come from the cache (e.g., offline mode) but isn't there."""
+
+
+class ResponseCache:
+    """
+    A persistent cache of Raider IO responses, stored in a single SQLite file.
+
+    Entries are keyed by ``(region, realm, name, fields)`` and expire ``ttl`` seconds after they were fetched. Once
+    more than ``max_entries`` responses are stored, the least recently used ones are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ttl: Optional[float] = 3600.0,
+        max_entries: int = 10000,
+    ) -> None:
+        """
+        path : string or ``Path``, optional
+            The SQLite file used to store responses. Its parent directory is created if it does not exist. Defaults to
+            ``DEFAULT_CACHE_PATH``.
+
+        ttl : float, optional
+            Number of seconds a response is considered fresh for. If ``None``, responses never expire.
+
+        max_entries : int, optional
+            The maximum number of responses kept before the least recently used are evicted.
+        """
+
+        if path is None:
+            path = DEFAULT_CACHE_PATH
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        if max_entries < 1:
+            raise ValueError(f"`max_entries` must be at least 1. Received {max_entries}.")
+        self._ttl = ttl
+        self._max_entries = max_entries
+
+        # The handler fetches from a thread pool, so a single connection is shared behind a lock.
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self._path), check_same_thread=False, timeout=30.0)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._connection.commit()
+
+    @property
+    def path(self) -> Path:
+        """
+        ``Path`` : the SQLite file responses are stored in.
+        """
+        return self._path
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """
+        float : number of seconds a response is considered fresh for. ``None`` means responses never expire.
+        """
+        return self._ttl
+
+    def _make_key(self, region: str, realm: str, name: str, fields: str) -> str:
+        return "|".join([region.lower(), realm.lower(), name.lower(), fields])
+
+    def get(
+        self, region: str, realm: str, name: str, fields: str, allow_expired: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached response, or ``None`` if there isn't one. Expired responses are only returned if
+        ``allow_expired`` is set (e.g., when running offline, a stale response is better than no response).
+        """
+
+        key = self._make_key(region, realm, name, fields)
+        now = time.time()
+
+        with self._lock:
+            row: Optional[Tuple[str, float]] = self._connection.execute(
+                "SELECT payload, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            payload, fetched_at = row
+            if not allow_expired and self._ttl is not None and now - fetched_at > self._ttl:
+                return None
+
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+
+        return loads(payload)
+
+    def set(self, region: str, realm: str, name: str, fields: str, payload: Dict[str, Any]) -> None:
+
+        key = self._make_key(region, realm, name, fields)
+        now = time.time()
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, dumps(payload), now, now),
+            )
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self) -> None:
+
+        # Only the least recently used entries beyond ``max_entries`` are removed.
+        self._connection.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self._max_entries,),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
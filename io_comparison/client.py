@@ -0,0 +1,126 @@
+from typing import TYPE_CHECKING, Any, Tuple, Type
+
+# ``requests`` is imported when a client is created rather than when this module is imported.
+if TYPE_CHECKING:
+    import requests
+
+
+class RaiderIOClient:
+    """
+    A reusable HTTP client for Raider IO.
+
+    Connections are pooled and kept alive between requests, so only the first request to a host pays for the TCP and
+    TLS handshakes. The client is intended to be long-lived (e.g., shared across many roster generations) and should be
+    closed when no longer needed, either explicitly or by using it as a context manager.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: Tuple[float, float] = (3.05, 30.0),
+        http2: bool = False,
+    ) -> None:
+        """
+        pool_size : int, optional
+            The maximum number of connections kept open to a single host. This should be at least the number of
+            requests that can be in flight at once, otherwise connections will be discarded and re-established.
+
+        timeout : tuple of floats, optional
+            The ``(connect, read)`` timeouts, in seconds, applied to every request.
+
+        http2 : bool, optional
+            Use HTTP/2 rather than HTTP/1.1. ``requests`` does not support HTTP/2, so this requires ``httpx`` to be
+            installed with its ``http2`` extra.
+        """
+
+        if pool_size < 1:
+            raise ValueError(f"`pool_size` must be at least 1. Received {pool_size}.")
+
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self._http2 = http2
+
+        if http2:
+            self._session = self._create_http2_session()
+        else:
+            self._session = self._create_session()
+
+    def _create_session(self) -> "requests.Session":
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self._pool_size, pool_maxsize=self._pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _create_http2_session(self) -> Any:
+
+        try:
+            import httpx
+        except ImportError as err:
+            raise ImportError("HTTP/2 support requires `httpx`. Install it with `pip install httpx[http2]`.") from err
+
+        connect_timeout, read_timeout = self._timeout
+        return httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=self._pool_size, max_keepalive_connections=self._pool_size),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+
+    @property
+    def pool_size(self) -> int:
+        """
+        int : the maximum number of connections kept open to a single host.
+        """
+        return self._pool_size
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """
+        tuple of floats : the ``(connect, read)`` timeouts, in seconds, applied to every request.
+        """
+        return self._timeout
+
+    @property
+    def http2(self) -> bool:
+        """
+        bool : whether requests are made over HTTP/2.
+        """
+        return self._http2
+
+    @property
+    def transport_errors(self) -> Tuple[Type[BaseException], ...]:
+        """
+        tuple of exception types : the exceptions raised for connection failures and timeouts. These are safe to retry.
+        """
+
+        if self._http2:
+            import httpx
+
+            return (httpx.TransportError,)
+
+        import requests
+
+        return (requests.ConnectionError, requests.Timeout)
+
+    def get(self, url: str) -> Any:
+        """
+        Issues a GET request to ``url`` and returns the response. Both the ``requests`` and ``httpx`` responses expose
+        ``status_code``, ``headers`` and the raw body as ``content``.
+        """
+
+        if self._http2:
+            return self._session.get(url)
+        return self._session.get(url, timeout=self._timeout)
+
+    def close(self) -> None:
+        self._session.close()
+
+    def __enter__(self) -> "RaiderIOClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
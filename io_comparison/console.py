@@ -0,0 +1,23 @@
+from typing import Any
+
+# ``rich`` and ``tqdm`` take a noticeable time to import, so they're only imported the first time something is shown.
+
+
+def print(*objects: Any, **kwargs: Any) -> None:
+    """
+    ``rich.print``, which renders console markup such as ``[bold magenta]``.
+    """
+
+    from rich import print as rich_print
+
+    rich_print(*objects, **kwargs)
+
+
+def progress_bar(**kwargs: Any) -> Any:
+    """
+    Returns a ``tqdm`` progress bar. Keyword arguments are passed through to ``tqdm``.
+    """
+
+    from tqdm import tqdm
+
+    return tqdm(**kwargs)
@@ -0,0 +1,221 @@
+import json
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypedDict, Union
+
+# ``orjson`` decodes several times faster than the standard library. It's optional; without it the standard library
+# is used and everything behaves the same.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class DecodeError(ValueError):
+    """
+    Raised when content is not valid JSON or doesn't match the expected schema.
+    """
+
+
+class _RosterEntryRequired(TypedDict):
+    player_handle: str
+    character_realm: str
+    character_name: str
+    region: str
+    guild: str
+
+
+class RosterEntry(_RosterEntryRequired, total=False):
+    notes: Optional[str]
+    special: bool
+
+
+# Rosters map a class to its specs, and each spec to the character playing it, e.g.,
+# ``{"priest": {"holy": {"player_handle": ..., "character_name": ..., ...}}}``.
+Roster = Dict[str, Dict[str, RosterEntry]]
+
+
+class RaidProgression(TypedDict, total=False):
+    summary: str
+    total_bosses: int
+    normal_bosses_killed: int
+    heroic_bosses_killed: int
+    mythic_bosses_killed: int
+    lfr_bosses_killed: int
+
+
+class IOResponse(TypedDict, total=False):
+    name: str
+    region: str
+    realm: str
+    last_crawled_at: Optional[str]
+    mythic_plus_scores: Dict[str, float]
+    raid_progression: Dict[str, RaidProgression]
+
+
+_ROSTER_ENTRY_KEYS = list(_RosterEntryRequired.__annotations__)
+
+# Raid summaries are in the form "<Num Bosses Killed>/<Num Bosses Available> <Difficulty letter>", e.g., "2/10 M".
+RAID_SUMMARY_PATTERN = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*([A-Z])\s*$")
+
+
+def backend() -> str:
+    """
+    Returns the name of the library used to decode JSON.
+    """
+    return "json" if orjson is None else "orjson"
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    """
+    Decodes the JSON document ``content``. Raises a ``DecodeError`` if it isn't valid JSON.
+    """
+
+    try:
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
+    except ValueError as err:
+        raise DecodeError(f"Invalid JSON: {err}") from err
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _check_type(value: Any, expected: Union[type, tuple], where: str) -> None:
+
+    # ``bool`` is a subclass of ``int`` but is never a valid count or score.
+    if not isinstance(value, expected) or (isinstance(value, bool) and bool not in _as_tuple(expected)):
+        raise DecodeError(f"Expected {where} to be of type {_type_names(expected)}. Received {value!r}.")
+
+
+def _as_tuple(expected: Union[type, tuple]) -> tuple:
+    return expected if isinstance(expected, tuple) else (expected,)
+
+
+def _type_names(expected: Union[type, tuple]) -> str:
+    return " or ".join(type_.__name__ for type_ in _as_tuple(expected))
+
+
+def validate_roster(data: Any) -> Roster:
+    """
+    Checks that ``data`` is a roster (see ``Roster``) and returns it. Raises a ``DecodeError`` describing the first
+    problem found otherwise.
+    """
+
+    _check_type(data, dict, "the roster")
+    for class_, class_data in data.items():
+        _check_type(class_data, dict, f"the specs of {class_}")
+
+        for spec, entry in class_data.items():
+            where = f"{class_}/{spec}"
+            _check_type(entry, dict, where)
+
+            for key in _ROSTER_ENTRY_KEYS:
+                if key not in entry:
+                    raise DecodeError(f"{where} is missing `{key}`.")
+                _check_type(entry[key], str, f"`{key}` of {where}")
+            if "notes" in entry:
+                _check_type(entry["notes"], (str, type(None)), f"`notes` of {where}")
+            if "special" in entry:
+                _check_type(entry["special"], bool, f"`special` of {where}")
+
+    return data
+
+
+def validate_response(data: Any) -> IOResponse:
+    """
+    Checks that ``data`` is a Raider IO character profile (see ``IOResponse``) and returns it. Only the fields that are
+    used are checked; anything else Raider IO returns is passed through untouched.
+    """
+
+    _check_type(data, dict, "the response")
+
+    if data.get("last_crawled_at") is not None:
+        _check_type(data["last_crawled_at"], str, "`last_crawled_at`")
+
+    if "mythic_plus_scores" in data:
+        _check_type(data["mythic_plus_scores"], dict, "`mythic_plus_scores`")
+        if "all" in data["mythic_plus_scores"]:
+            _check_type(data["mythic_plus_scores"]["all"], (int, float), "`mythic_plus_scores.all`")
+
+    if "raid_progression" in data:
+        _check_type(data["raid_progression"], dict, "`raid_progression`")
+        for raid, raid_results in data["raid_progression"].items():
+            where = f"`raid_progression.{raid}`"
+            _check_type(raid_results, dict, where)
+
+            for key, value in raid_results.items():
+                if key == "total_bosses" or key.endswith("_bosses_killed"):
+                    _check_type(value, int, f"{where}.{key}")
+
+            # Progression is read from the kill counts when there are any, and from the summary otherwise, so one of
+            # the two has to be complete.
+            if "summary" in raid_results:
+                _check_type(raid_results["summary"], str, f"{where}.summary")
+                if RAID_SUMMARY_PATTERN.match(raid_results["summary"]) is None:
+                    raise DecodeError(f"Could not parse {where}.summary {raid_results['summary']!r}.")
+            elif "total_bosses" not in raid_results or not any(key.endswith("_bosses_killed") for key in raid_results):
+                raise DecodeError(f"{where} has neither a `summary` nor `total_bosses` and kill counts.")
+
+    return data
+
+
+def decode_roster(content: Union[bytes, str]) -> Roster:
+    return validate_roster(loads(content))
+
+
+def decode_response(content: Union[bytes, str]) -> IOResponse:
+    return validate_response(loads(content))
+
+
+def load_roster(fname: Union[str, Path]) -> Roster:
+    """
+    Reads and validates the roster JSON file ``fname``.
+    """
+
+    with open(fname, "rb") as f:
+        content = f.read()
+
+    try:
+        return decode_roster(content)
+    except DecodeError as err:
+        raise DecodeError(f"{fname}: {err}") from err
+
+
+def iter_dump(
+    fname: Union[str, Path],
+    on_error: Optional[Callable[[DecodeError], None]] = None,
+    select: Optional[Callable[[Any], bool]] = None,
+) -> Iterator[Tuple[int, IOResponse]]:
+    """
+    Streams the NDJSON dump ``fname`` (one Raider IO character profile per line), yielding ``(line number,
+    response)``. Only one line is held in memory at a time, so dumps of any size can be read. Blank lines are skipped.
+
+    If ``select`` is given, it's called with each decoded line before it's validated, and lines it returns ``False``
+    for are skipped without being validated (e.g., characters that aren't wanted).
+
+    An invalid line raises a ``DecodeError`` naming the file and line. If ``on_error`` is given, that error is passed
+    to it instead and the line is skipped, so one bad line doesn't stop the rest of the dump from being read.
+    """
+
+    with open(fname, "rb") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                data = loads(line)
+                if select is not None and not select(data):
+                    continue
+                io_results = validate_response(data)
+            except DecodeError as err:
+                line_err = DecodeError(f"{fname}:{line_number}: {err}")
+                if on_error is None:
+                    raise line_err from err
+                on_error(line_err)
+                continue
+            yield line_number, io_results
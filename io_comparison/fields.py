@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+# The Raider IO field each ``Profile`` attribute is read from, along with the keys of that field which are kept once a
+# response is projected. ``None`` keeps the whole field.
+PROFILE_FIELDS: Dict[str, Tuple[str, Optional[Tuple[str, ...]]]] = {
+    "score": ("mythic_plus_scores", ("all",)),
+    "progression": ("raid_progression", None),
+}
+
+# Top level keys kept in every projected response. ``last_crawled_at`` is what ``RefreshState`` compares between runs.
+_ALWAYS_KEPT = ["last_crawled_at"]
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    """
+    The ``Profile`` attributes a caller needs from Raider IO.
+
+    Only the Raider IO ``fields`` those attributes are read from are requested, and responses are projected down to the
+    keys they use before being cached, so unused data is never stored.
+
+    attributes : tuple of strings, optional
+        The ``Profile`` attributes to fill in from Raider IO. Must be keys of ``PROFILE_FIELDS``. Attributes that aren't
+        selected are left at an empty default (a score of 0 and no progression).
+
+    raids : tuple of strings, optional
+        If specified, only the progression of these raids (e.g., ``"castle-nathria"``) is kept. Otherwise the
+        progression of every raid is kept.
+    """
+
+    attributes: Tuple[str, ...] = tuple(PROFILE_FIELDS)
+    raids: Optional[Tuple[str, ...]] = None
+
+    def __post_init__(self) -> None:
+
+        unknown = [attribute for attribute in self.attributes if attribute not in PROFILE_FIELDS]
+        if unknown:
+            raise ValueError(f"Cannot fetch {unknown} from Raider IO. Choose from {list(PROFILE_FIELDS)}.")
+
+        # Normalised so that equivalent selections share cache entries. Frozen, so set through ``object.__setattr__``.
+        object.__setattr__(self, "attributes", tuple(a for a in PROFILE_FIELDS if a in self.attributes))
+        if self.raids is not None:
+            object.__setattr__(self, "raids", tuple(sorted(set(self.raids))))
+
+    def __contains__(self, attribute: str) -> bool:
+        return attribute in self.attributes
+
+    @property
+    def fields(self) -> Optional[str]:
+        """
+        str : the value of the ``fields`` query parameter, or ``None`` if no fields are needed.
+        """
+        if not self.attributes:
+            return None
+        return ",".join(PROFILE_FIELDS[attribute][0] for attribute in self.attributes)
+
+    @property
+    def cache_key(self) -> str:
+        """
+        str : identifies the projected responses of this selection in a ``ResponseCache``.
+        """
+
+        key = self.fields or ""
+        if self.raids is not None:
+            key = f"{key};raids={','.join(self.raids)}"
+        return key
+
+    def project(self, io_results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns a copy of the Raider IO response ``io_results`` with only the keys this selection uses.
+        """
+
+        projected = {key: io_results[key] for key in _ALWAYS_KEPT if key in io_results}
+
+        for attribute in self.attributes:
+            field, keys = PROFILE_FIELDS[attribute]
+            if field not in io_results:
+                continue
+
+            value = io_results[field]
+            if keys is not None:
+                value = {key: value[key] for key in keys if key in value}
+            if field == "raid_progression" and self.raids is not None:
+                value = {raid: value[raid] for raid in self.raids if raid in value}
+            projected[field] = value
+
+        return projected
@@ -1,11 +1,100 @@
+from bisect import bisect_right
+from typing import Any, List, Tuple
+
+import numpy as np
+
+
 # A dictionary where the keys are tuples ``(lower_bound, upper_bound)``. Items are returned if
 # ``lower_bound <= item < upper_bound``.  This allows one to build a dictionary where the keys are "float ranges".
+#
+# The ranges must not overlap. Their bounds are kept sorted alongside the dictionary so that a lookup is a single
+# ``bisect`` rather than a scan over every range.
 class FloatRangeDict(dict):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+
+        ranges = sorted(super().items(), key=lambda item: item[0][0])
+
+        for (lower, upper), _ in ranges:
+            if not lower < upper:
+                raise ValueError(f"Range {(lower, upper)} must have its lower bound below its upper bound.")
+        for ((_, previous_upper), _), ((lower, upper), _) in zip(ranges, ranges[1:]):
+            if lower < previous_upper:
+                raise ValueError(f"Range {(lower, upper)} overlaps with a range ending at {previous_upper}.")
+
+        self._lower_bounds: List[float] = [key[0] for key, _ in ranges]
+        self._upper_bounds: List[float] = [key[1] for key, _ in ranges]
+        self._values: List[Any] = [value for _, value in ranges]
+
     def __getitem__(self, item):
         if type(item) != tuple:
-            for key in self:
-                if item >= key[0] and item < key[1]:
-                    return self[key]
+            idx = bisect_right(self._lower_bounds, item) - 1
+            if idx >= 0 and item < self._upper_bounds[idx]:
+                return self._values[idx]
             raise KeyError(item)
         else:
             return super().__getitem__(item)
+
+    def lookup_many(self, items: np.ndarray) -> np.ndarray:
+        """
+        Returns the value for every element of ``items`` at once. Raises a ``KeyError`` if any element is not within a
+        range.
+        """
+
+        items = np.asarray(items)
+        inds = np.searchsorted(self._lower_bounds, items, side="right") - 1
+
+        in_range = inds >= 0
+        in_range[in_range] &= items[in_range] < np.asarray(self._upper_bounds)[inds[in_range]]
+        if not in_range.all():
+            raise KeyError(items[~in_range].tolist())
+
+        values = np.empty(len(self._values), dtype=object)
+        values[:] = self._values
+        return values[inds]
+
+    def __setitem__(self, key: Tuple[float, float], value: Any) -> None:
+        previous = dict(self)
+        super().__setitem__(key, value)
+        self._rebuild_or_restore(previous)
+
+    def __delitem__(self, key: Tuple[float, float]) -> None:
+        super().__delitem__(key)
+        self._rebuild()
+
+    def _rebuild_or_restore(self, previous: dict) -> None:
+
+        # Leave the dictionary untouched if the new range is invalid.
+        try:
+            self._rebuild()
+        except ValueError:
+            super().clear()
+            super().update(previous)
+            raise
+
+    def update(self, *args, **kwargs) -> None:
+        previous = dict(self)
+        super().update(*args, **kwargs)
+        self._rebuild_or_restore(previous)
+
+    def setdefault(self, key: Tuple[float, float], default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return super().__getitem__(key)
+
+    def pop(self, *args) -> Any:
+        value = super().pop(*args)
+        self._rebuild()
+        return value
+
+    def popitem(self) -> Tuple[Tuple[float, float], Any]:
+        item = super().popitem()
+        self._rebuild()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._rebuild()
@@ -0,0 +1,164 @@
+import json
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+import io_comparison.settings as settings
+
+ICON_DIR = Path(__file__).parent.joinpath("../data/icons")
+ICON_ATLAS_PATH = ICON_DIR.joinpath("atlas.npy")
+
+_ATLAS_ALIGNMENT = 16  # Bytes. Keeps every icon aligned for its dtype within the packed buffer.
+
+
+def snakify(text: str) -> str:
+    x = re.sub(r"[^a-zA-Z0-9\s\-\_]", "", text.lower())
+    return re.sub(r"\W", "_", x)
+
+
+def _atlas_index_path(atlas_path: Path) -> Path:
+    return atlas_path.with_suffix(".json")
+
+
+class IconStore:
+    """
+    Decodes icons on first use and keeps them for the lifetime of the store.
+
+    Icons are looked up either by name (the file stem in ``icon_dir``, e.g., ``"druid_feral"``) or by a ``(class,
+    spec)`` tuple as used by the plotter, where ``spec`` is ``None`` for the class icon. If a packed atlas (see
+    ``build_atlas``) is available, icons are read as views into a single memory-mapped array rather than decoded from
+    their individual image files.
+    """
+
+    def __init__(self, icon_dir: Union[str, Path] = ICON_DIR, atlas_path: Optional[Union[str, Path]] = None) -> None:
+
+        self._icon_dir = Path(icon_dir)
+        self._icons: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+        self._atlas: Optional[np.ndarray] = None
+        self._atlas_index: Dict[str, Tuple[int, Tuple[int, ...], str]] = {}
+        if atlas_path is not None:
+            self._load_atlas(Path(atlas_path))
+
+    def _load_atlas(self, atlas_path: Path) -> None:
+
+        with open(_atlas_index_path(atlas_path), "r") as f:
+            index = json.load(f)
+
+        self._atlas = np.load(atlas_path, mmap_mode="r")
+        self._atlas_index = {name: (offset, tuple(shape), dtype) for name, (offset, shape, dtype) in index.items()}
+
+    def _name_from_key(self, key: Union[str, Tuple[str, Optional[str]]]) -> str:
+
+        if isinstance(key, str):
+            return snakify(key)
+
+        class_, spec = key
+        if spec is None:
+            return snakify(class_)
+        return f"{snakify(class_)}_{snakify(spec)}"
+
+    def _read_from_atlas(self, name: str) -> np.ndarray:
+
+        offset, shape, dtype = self._atlas_index[name]
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        return self._atlas[offset : offset + nbytes].view(dtype).reshape(shape)
+
+    def _decode(self, name: str) -> np.ndarray:
+        # Only imported when an icon has to be decoded, i.e., when there is no atlas.
+        import matplotlib.image as mpimg
+
+        for image_format in ["jpg", "png"]:
+            fname = self._icon_dir.joinpath(f"{name}.{image_format}")
+            if fname.exists():
+                return mpimg.imread(fname)
+
+        raise KeyError(f"No icon named {name} in {self._icon_dir}.")
+
+    def __getitem__(self, key: Union[str, Tuple[str, Optional[str]]]) -> np.ndarray:
+
+        name = self._name_from_key(key)
+
+        # Fast path without the lock; dict reads are atomic.
+        icon = self._icons.get(name)
+        if icon is not None:
+            return icon
+
+        with self._lock:
+            if name not in self._icons:
+                if name in self._atlas_index:
+                    self._icons[name] = self._read_from_atlas(name)
+                else:
+                    self._icons[name] = self._decode(name)
+            return self._icons[name]
+
+    def __contains__(self, key: Union[str, Tuple[str, Optional[str]]]) -> bool:
+        return self._name_from_key(key) in self._icons
+
+    def build_atlas(self, atlas_path: Union[str, Path] = ICON_ATLAS_PATH, names: Optional[Iterable[str]] = None) -> Path:
+        """
+        Packs icons into a single flat ``.npy`` byte buffer alongside a ``.json`` index of ``name -> (offset, shape,
+        dtype)``. Loading the atlas memory-maps the buffer, so no image decoding happens at all.
+
+        If ``names`` is not specified, every class and spec icon along with the Raider IO logo is packed.
+        """
+
+        if names is None:
+            names = default_icon_names()
+
+        index: Dict[str, Tuple[int, Tuple[int, ...], str]] = {}
+        chunks = []
+        offset = 0
+        for name in names:
+            icon = np.ascontiguousarray(self[name])
+            data = icon.view(np.uint8).ravel()
+
+            index[name] = (offset, icon.shape, icon.dtype.str)
+            padding = -len(data) % _ATLAS_ALIGNMENT
+            chunks.extend([data, np.zeros(padding, dtype=np.uint8)])
+            offset += len(data) + padding
+
+        atlas_path = Path(atlas_path)
+        np.save(atlas_path, np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint8))
+        with open(_atlas_index_path(atlas_path), "w") as f:
+            json.dump(index, f)
+
+        return atlas_path
+
+
+def default_icon_names() -> Iterable[str]:
+
+    names = ["raider_io"]
+    for class_, specs in settings.CLASSES_SPECS.items():
+        names.append(snakify(class_))
+        names.extend(f"{snakify(class_)}_{snakify(spec)}" for spec in specs)
+    return names
+
+
+@lru_cache(maxsize=None)
+def get_icon_store() -> IconStore:
+    """
+    Returns the process-wide icon store, using the prebuilt atlas at ``ICON_ATLAS_PATH`` if there is one.
+    """
+
+    atlas_path = ICON_ATLAS_PATH if ICON_ATLAS_PATH.exists() else None
+    return IconStore(atlas_path=atlas_path)
+
+
+def load_background(tag: str) -> Optional[np.ndarray]:
+    """
+    Returns the image named ``tag`` in ``ICON_DIR`` (e.g., ``"wowhead"``) to draw behind a plot, or ``None`` if there
+    isn't one; the plot is then drawn on a plain background.
+    """
+    import matplotlib.image as mpimg
+
+    for image_format in ["png", "jpg"]:
+        fname = ICON_DIR.joinpath(f"{tag}.{image_format}")
+        if fname.exists():
+            return mpimg.imread(fname)
+    return None
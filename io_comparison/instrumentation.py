@@ -0,0 +1,159 @@
+import cProfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Union
+
+from io_comparison.decoding import dumps
+
+# Upper edges (in seconds) of the buckets span durations are counted into in a report. The last bucket is unbounded.
+HISTOGRAM_BUCKETS = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0]
+
+
+class Instrumentation:
+    """
+    Records how long each stage of generating and plotting profiles takes, along with counters such as cache hits and
+    retries.
+
+    Stages are timed with ``span``. Every duration is kept, so a span entered once per character (e.g., the latency of
+    each fetch) doubles as a histogram in ``report``. Spans and counters can be recorded from any thread.
+
+    Use ``NULL_INSTRUMENTATION`` (the default of ``ProfileHandler`` and ``Plotter``) to record nothing at all.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._durations: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+
+    @contextmanager
+    def _span(self, name: str) -> Iterator[None]:
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._durations.setdefault(name, []).append(duration)
+
+    def span(self, name: str) -> ContextManager[None]:
+        """
+        Returns a context manager that records the time spent inside it under ``name``.
+        """
+        return self._span(name)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def get_durations(self, name: str) -> List[float]:
+        """
+        Returns every duration recorded under ``name``, in seconds.
+        """
+        with self._lock:
+            return list(self._durations.get(name, []))
+
+    def get_counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._counters.clear()
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Returns a summary of every span (in order of first use) and counter, e.g.,
+        ``{"spans": {"fetch.character": {"count": 36, "total": 1.2, "mean": ..., "p50": ..., "histogram": [...]}},
+        "counters": {"cache.hits": 12}}``. Times are in seconds. ``histogram`` counts the durations falling into each
+        bucket of ``HISTOGRAM_BUCKETS`` (plus a final unbounded bucket).
+        """
+        # Only needed once a report is asked for, so enabling instrumentation doesn't slow down importing.
+        import numpy as np
+
+        with self._lock:
+            durations = {name: np.array(values) for name, values in self._durations.items()}
+            counters = dict(self._counters)
+
+        spans = {}
+        for name, values in durations.items():
+            histogram = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+            for value in values:
+                histogram[bisect_left(HISTOGRAM_BUCKETS, value)] += 1
+
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            spans[name] = {
+                "count": len(values),
+                "total": float(values.sum()),
+                "mean": float(values.mean()),
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "p50": float(p50),
+                "p90": float(p90),
+                "p99": float(p99),
+                "histogram": histogram,
+            }
+
+        return {"spans": spans, "counters": counters, "histogram_buckets": HISTOGRAM_BUCKETS}
+
+    def save_report(self, path: Union[str, Path]) -> None:
+        """
+        Writes ``report`` to the JSON file ``path``.
+        """
+        Path(path).write_text(dumps(self.report()))
+
+
+class _NullInstrumentation(Instrumentation):
+
+    # A single reusable context manager, so a disabled span costs no more than a method call.
+    enabled = False
+    _NULL_SPAN = nullcontext()
+
+    def span(self, name: str) -> ContextManager[None]:
+        return self._NULL_SPAN
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        pass
+
+
+NULL_INSTRUMENTATION = _NullInstrumentation()
+
+
+@contextmanager
+def profile_to(path: Union[str, Path]) -> Iterator[None]:
+    """
+    Profiles the code run inside the context and writes the result to ``path`` once it exits.
+
+    If ``path`` ends in ``.html``, ``pyinstrument`` (an optional dependency) is used and its HTML report is written.
+    Otherwise ``cProfile`` is used and the stats are written in ``pstats`` format (e.g., for ``snakeviz``). Note that
+    ``cProfile`` only profiles the calling thread, not the fetch workers.
+    """
+
+    path = Path(path)
+    if path.suffix == ".html":
+        try:
+            from pyinstrument import Profiler
+        except ImportError as err:
+            raise ImportError("Writing an HTML profile requires `pyinstrument` to be installed.") from err
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            path.write_text(profiler.output_html())
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(str(path))
@@ -1,17 +1,33 @@
-import json
+import sys
+import threading
 from collections import defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-import requests
-from tqdm import tqdm
-
-from rich import print
-from io_comparison.utils import determine_number_players
-
-_RAID = "castle-nathria"  # FIXME: Should be a passable argument somewhere. Should be a list of raids.
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from io_comparison.cache import CacheMissError, ResponseCache
+from io_comparison.console import print, progress_bar
+from io_comparison.decoding import (
+    RAID_SUMMARY_PATTERN,
+    DecodeError,
+    IOResponse,
+    Roster,
+    decode_response,
+    iter_dump,
+    load_roster,
+    loads,
+    validate_roster,
+)
+from io_comparison.fields import FieldSelection
+from io_comparison.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+from io_comparison.refresh import RefreshState
+from io_comparison.scheduler import FetchError, FetchScheduler, RetryPolicy, TokenBucket
+
+if TYPE_CHECKING:
+    from io_comparison.client import RaiderIOClient
 
 class Difficulty(Enum):
     M = "Mythic"
@@ -19,13 +35,63 @@ class Difficulty(Enum):
     N = "Normal"
     L = "LFR"  # TODO: See what the abbreviation for LFR is.
 
-@dataclass
+
+# The structured ``<difficulty>_bosses_killed`` fields of a raid, from the hardest difficulty to the easiest.
+_DIFFICULTY_FIELDS = [
+    ("mythic_bosses_killed", Difficulty.M),
+    ("heroic_bosses_killed", Difficulty.H),
+    ("normal_bosses_killed", Difficulty.N),
+    ("lfr_bosses_killed", Difficulty.L),
+]
+
+# Profiles and their progression are immutable and slotted (no per-instance ``__dict__``, which needs Python 3.10) as
+# long-running services keep many rosters in memory. Strings shared between many characters are interned and identical
+# progression is shared between profiles, so each profile only pays for what is unique to it.
+@dataclass(frozen=True, slots=True)
 class Progression:
     number_killed: int
     number_bosses: int
     difficulty: Difficulty
 
-@dataclass
+
+class ProgressionByRaid(Mapping[str, Progression]):
+    """
+    A read-only mapping of raid slug to ``Progression``. Unlike ``MappingProxyType``, it can be pickled (e.g., to send
+    profiles to a worker process) and deep copied.
+    """
+
+    __slots__ = ("_progression",)
+
+    def __init__(self, progression: Mapping[str, Progression]) -> None:
+        self._progression = dict(progression)
+
+    def __getitem__(self, raid: str) -> Progression:
+        return self._progression[raid]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._progression)
+
+    def __len__(self) -> int:
+        return len(self._progression)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._progression!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (self._progression,))
+
+
+@lru_cache(maxsize=4096)
+def _share_progression(items: Tuple[Tuple[str, Progression], ...]) -> ProgressionByRaid:
+    return ProgressionByRaid(items)
+
+
+@lru_cache(maxsize=4096)
+def _make_progression(number_killed: int, number_bosses: int, difficulty: Difficulty) -> Progression:
+    return Progression(number_killed, number_bosses, difficulty)
+
+
+@dataclass(frozen=True, slots=True)
 class Profile:
     class_: str
     spec: str
@@ -35,99 +101,592 @@ class Profile:
     region: str
     score: float
     guild: str
-    progression: Dict[str, Progression]
+    progression: Mapping[str, Progression]
     notes: Optional[str] = None
     special: bool = False
 
+    def __post_init__(self) -> None:
+
+        # Frozen, so fields have to be replaced through ``object.__setattr__``.
+        for name in ["class_", "spec", "character_realm", "region", "guild"]:
+            object.__setattr__(self, name, sys.intern(getattr(self, name)))
+        object.__setattr__(self, "progression", _share_progression(tuple(self.progression.items())))
+
     def get_player_string(self) -> str:
+        return format_player_string(self.player_handle, self.character_name, self.character_realm, self.special)
+
+
+def format_player_string(player_handle: str, character_name: str, character_realm: str, special: bool) -> str:
+
+    if special:
+        extra = " *"
+    else:
+        extra = ""
+
+    string = f"{player_handle.title()} ({character_name.title()}) - {character_realm.title()}{extra}"
+    return string
+
+
+@dataclass
+class FetchFailure:
+    region: str
+    character_realm: str
+    character_name: str
+    reason: str
+    status_code: Optional[int] = None
 
-        if self.special:
-            extra = " *"
-        else:
-            extra = ""
 
-        string = f"{self.player_handle.title()} ({self.character_name.title()}) - {self.character_realm.title()}{extra}"
-        return string
+@dataclass
+class GenerationSummary:
+    number_characters: int = 0
+    number_fetched: int = 0
+    number_collapsed: int = 0
+    number_retries: int = 0
+    number_changed: int = 0
+    number_unchanged: int = 0
+    failures: List[FetchFailure] = field(default_factory=list)
+
+    # Lines of an imported dump that were skipped as invalid. Only the first ``MAX_REPORTED_INVALID_LINES`` are kept, as
+    # "<dump>:<line number>: <problem>", so a dump that's mostly invalid doesn't fill memory (or the console).
+    number_invalid_lines: int = 0
+    invalid_lines: List[str] = field(default_factory=list)
+
+    @property
+    def number_failed(self) -> int:
+        return len(self.failures)
+
+
+def character_key(character_realm: str, character_name: str, region: str, **kwargs) -> Tuple[str, str, str]:
+    """
+    The key identifying a unique character. Raider IO is case insensitive so two roster entries that only differ in
+    case refer to the same character. Realms may be given by name (e.g., "Tarren Mill", as in Raider IO responses) or
+    by slug (e.g., "tarren-mill", as in rosters).
+    """
+    realm_slug = character_realm.lower().replace("'", "").replace(" ", "-")
+    return (region.lower(), realm_slug, character_name.lower())
+
+
+def _get_dump_key(data: Any) -> Optional[Tuple[str, str, str]]:
+
+    # The character a line of a dump is for, or ``None`` if the line doesn't say.
+    if not isinstance(data, dict):
+        return None
+    realm, name, region = data.get("realm"), data.get("name"), data.get("region")
+    if not all(isinstance(value, str) for value in [realm, name, region]):
+        return None
+    return character_key(realm, name, region)
+
+
+# The number of invalid lines of a dump that are described in the summary. The rest are only counted.
+MAX_REPORTED_INVALID_LINES = 10
+
+# The sustained number of requests per second sent to Raider IO by default.
+DEFAULT_RATE_LIMIT = 5.0
 
 
 class ProfileHandler:
 
     _BASE_IO_URL = "https://raider.io/api/v1/characters/profile?"
-    def __init__(self) -> None:
-        pass
+    _DEFAULT_MAX_WORKERS = 8
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        base_url: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+        offline: bool = False,
+        client: Optional["RaiderIOClient"] = None,
+        rate_limit: Optional[float] = DEFAULT_RATE_LIMIT,
+        retry_policy: Optional[RetryPolicy] = None,
+        refresh_state: Optional[RefreshState] = None,
+        field_selection: Optional[FieldSelection] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
+        """
+        max_workers : int, optional
+            The maximum number of Raider IO requests that will be in flight at once. Use 1 to fetch characters one
+            after another.
+
+        base_url : string, optional
+            The Raider IO character profile endpoint. Useful for pointing the handler at a local server.
+
+        cache : ``ResponseCache``, optional
+            If specified, responses are read from and written to this cache rather than always hitting Raider IO.
+
+        offline : bool, optional
+            If set, Raider IO is never contacted and every character must be present in ``cache`` (expired responses
+            are accepted). A ``CacheMissError`` is raised for any character that isn't.
+
+        client : ``RaiderIOClient``, optional
+            The pooled HTTP client used to contact Raider IO. If not specified, one is created on the first request
+            with a pool large enough for ``max_workers`` and closed along with the handler. A client that is passed in
+            is owned by the caller and is left open, so it can be shared between handlers.
+
+        rate_limit : float, optional
+            The sustained number of requests per second sent to Raider IO (retries included). If ``None``, requests are
+            not rate limited.
+
+        retry_policy : ``RetryPolicy``, optional
+            Controls how rate limited (429) and server error (5xx) responses are retried.
+
+        refresh_state : ``RefreshState``, optional
+            If specified, characters that were seen in a previous run are first probed for their ``last_crawled_at``
+            and only refetched in full if Raider IO has crawled them since. The number of characters whose data changed
+            is recorded in ``summary`` and the state is saved after every generation.
+
+        field_selection : ``FieldSelection``, optional
+            The ``Profile`` attributes (and raids) to fetch. Only the Raider IO fields these need are requested and
+            responses are projected down to them before being cached. If not specified, every attribute and raid is
+            fetched.
+
+        instrumentation : ``Instrumentation``, optional
+            If specified, the time spent loading the roster, on each HTTP request, decoding responses and formatting
+            profiles is recorded, along with the latency of each character and counters of cache hits, retries and
+            failures. Nothing is recorded by default.
+        """
+
+        if offline and cache is None:
+            raise ValueError("A `cache` must be specified to run `offline`.")
+        self._cache = cache
+        self._offline = offline
+
+        if max_workers is None:
+            max_workers = self._DEFAULT_MAX_WORKERS
+        if max_workers < 1:
+            raise ValueError(f"`max_workers` must be at least 1. Received {max_workers}.")
+        self._max_workers = max_workers
+
+        if base_url is None:
+            base_url = self._BASE_IO_URL
+        self._base_url = base_url
+
+        # The client (and the scheduler, which needs to know its transport errors) is created on the first request, so
+        # runs that never contact Raider IO (e.g., offline) don't import the HTTP library at all.
+        self._owns_client = client is None
+        self._client = client
+        self._rate_limiter = None if rate_limit is None else TokenBucket(rate_limit)
+        self._retry_policy = retry_policy
+        self._scheduler: Optional[FetchScheduler] = None
+        self._scheduler_lock = threading.Lock()
+
+        self._refresh_state = refresh_state
+
+        if field_selection is None:
+            field_selection = FieldSelection()
+        self._field_selection = field_selection
+
+        if instrumentation is None:
+            instrumentation = NULL_INSTRUMENTATION
+        self._instrumentation = instrumentation
+
+        # Fetches update the summary from the worker threads.
+        self._summary = GenerationSummary()
+        self._summary_lock = threading.Lock()
+
+    def close(self) -> None:
+        if self._owns_client and self._client is not None:
+            self._client.close()
+            self._client = None
+            self._scheduler = None
+
+    def _get_scheduler(self) -> FetchScheduler:
+
+        with self._scheduler_lock:
+            if self._scheduler is None:
+                if self._client is None:
+                    from io_comparison.client import RaiderIOClient
+
+                    self._client = RaiderIOClient(pool_size=self._max_workers)
+                self._scheduler = FetchScheduler(
+                    rate_limiter=self._rate_limiter,
+                    retry_policy=self._retry_policy,
+                    transport_errors=self._client.transport_errors,
+                )
+            return self._scheduler
+
+    @property
+    def _number_retries(self) -> int:
+        return 0 if self._scheduler is None else self._scheduler.number_retries
+
+    def __enter__(self) -> "ProfileHandler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def summary(self) -> GenerationSummary:
+        """
+        ``GenerationSummary`` : statistics of the most recent call to ``generate_player_profiles``.
+        """
+        return self._summary
 
     def generate_player_profiles(
-        self, fname: Optional[str] = None, data: Optional[Dict[str, Any]] = None
+        self, fname: Optional[str] = None, data: Optional[Roster] = None
     ) -> List[Profile]:
 
-        if fname is not None and data is not None:
-            raise ValueError(f"Only one of `fname` and `data` can be specified.")
+        # Profiles are streamed in completion order; restore the roster order.
+        indexed_profiles = sorted(self._iter_indexed_profiles(fname, data), key=lambda indexed: indexed[0])
+        profiles: List[Profile] = [profile for _, profile in indexed_profiles]
+        return profiles
+
+    def iter_player_profiles(
+        self, fname: Optional[str] = None, data: Optional[Roster] = None
+    ) -> Iterator[Profile]:
+        """
+        Yields each ``Profile`` as soon as its character has been fetched, i.e., in completion order rather than roster
+        order. Characters that fail to fetch are skipped and reported in ``summary`` once the iterator is exhausted.
+        """
+
+        for _, profile in self._iter_indexed_profiles(fname, data):
+            yield profile
+
+    def import_player_profiles(
+        self, dump_fname: str, fname: Optional[str] = None, data: Optional[Roster] = None
+    ) -> List[Profile]:
+        """
+        Generates profiles from an NDJSON dump of Raider IO character profiles (one response per line) rather than by
+        fetching them, so Raider IO is never contacted.
+
+        The dump is streamed one line at a time and each line is matched against the roster by its region, realm and
+        name. Only the responses of roster characters are kept, so memory use doesn't grow with the size of the dump.
+        Characters that aren't in the dump are reported in ``summary`` as failures. If the handler has a ``cache``,
+        the imported responses are also written to it so later runs (including ``offline`` ones) can use them.
+        """
+
+        indexed_profiles = sorted(
+            self._iter_indexed_profiles(fname, data, dump_fname=dump_fname), key=lambda indexed: indexed[0]
+        )
+        profiles: List[Profile] = [profile for _, profile in indexed_profiles]
+        return profiles
 
-        if fname is not None:
-            data = self._load_data(fname)
+    def _iter_indexed_profiles(
+        self, fname: Optional[str] = None, data: Optional[Roster] = None, dump_fname: Optional[str] = None
+    ) -> Iterator[Tuple[int, Profile]]:
 
-        profiles: List[Profile] = []
+        if fname is not None and data is not None:
+            raise ValueError(f"Only one of `fname` and `data` can be specified.")
 
-        number_characters = determine_number_players(data)
-        print(f"Generating profiles for [bold magenta]{number_characters}[/] characters.")
-        pbar = tqdm(total=number_characters)
+        with self._instrumentation.span("roster.load" if fname is not None else "roster.validate"):
+            if fname is not None:
+                data = load_roster(fname)
+            else:
+                data = validate_roster(data)
 
+        entries: List[Tuple[str, str, Dict[str, str]]] = []
         for class_, class_data in data.items():
             for spec, spec_data in class_data.items():
                 if spec_data["character_name"] == "None":
                     continue
-                io_results = self._fetch_io_results(**spec_data)
-                profiles.append(self._format_io_results(io_results, class_, spec, spec_data))
+                entries.append((class_, spec, spec_data))
+        print(f"Generating profiles for [bold magenta]{len(entries)}[/] characters.")
+
+        # The same character is often listed under multiple specs. Only fetch each unique character once and fan the
+        # result back out to every entry that refers to it.
+        entries_by_character: Dict[Tuple[str, str, str], List[int]] = defaultdict(list)
+        for idx, (_, _, spec_data) in enumerate(entries):
+            entries_by_character[character_key(**spec_data)].append(idx)
+        unique_characters = [entries[inds[0]][2] for inds in entries_by_character.values()]
+
+        self._summary = GenerationSummary(
+            number_characters=len(entries),
+            number_fetched=len(unique_characters),
+            number_collapsed=len(entries) - len(unique_characters),
+        )
+        number_retries = self._number_retries
+
+        if dump_fname is None:
+            io_results_iter = self._iter_io_results(unique_characters)
+        else:
+            io_results_iter = self._iter_dump_results(unique_characters, dump_fname)
+
+        # Characters that failed to fetch, or whose response is missing what the profile needs, are dropped. The rest
+        # of the roster is still returned.
+        for spec_data, io_results in io_results_iter:
+            inds = entries_by_character[character_key(**spec_data)]
+            try:
+                profiles = [(idx, self._format_io_results(io_results, *entries[idx])) for idx in inds]
+            except DecodeError as err:
+                self._add_failure(spec_data, f"Malformed response: {err}")
+                continue
+            yield from profiles
+
+        self._summary.number_retries = self._number_retries - number_retries
+        self._instrumentation.increment("fetch.retries", self._summary.number_retries)
+        self._instrumentation.increment("fetch.failures", self._summary.number_failed)
+        if self._refresh_state is not None:
+            self._refresh_state.save()
+
+        print(
+            f"Fetched [bold magenta]{self._summary.number_fetched}[/] unique characters "
+            f"([bold magenta]{self._summary.number_collapsed}[/] duplicate lookups collapsed, "
+            f"[bold magenta]{self._summary.number_retries}[/] retries)."
+        )
+        if self._refresh_state is not None:
+            print(
+                f"[bold magenta]{self._summary.number_changed}[/] characters changed since the last run "
+                f"([bold magenta]{self._summary.number_unchanged}[/] unchanged characters were not refetched)."
+            )
+        for failure in self._summary.failures:
+            print(
+                f"[bold red]Failed[/] to fetch {failure.character_name}-{failure.character_realm} "
+                f"({failure.region}): {failure.reason}"
+            )
+        for invalid_line in self._summary.invalid_lines:
+            print(f"[bold yellow]Skipped[/] invalid line {invalid_line}")
+        number_unreported = self._summary.number_invalid_lines - len(self._summary.invalid_lines)
+        if number_unreported > 0:
+            print(f"[bold yellow]Skipped[/] [bold magenta]{number_unreported}[/] more invalid lines.")
+
+    def _iter_io_results(self, characters: List[Dict[str, str]]) -> Iterator[Tuple[Dict[str, str], Dict[str, Any]]]:
+
+        # Requests are dispatched to a bounded pool and each result is yielded (and the progress bar ticked) as soon as
+        # it completes. A character that fails is recorded in the summary rather than aborting the whole roster.
+        pbar = progress_bar(total=len(characters))
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = {executor.submit(self._fetch_character, spec_data): spec_data for spec_data in characters}
+            try:
+                for future in as_completed(futures):
+                    spec_data = futures[future]
+                    pbar.update(1)
+                    try:
+                        io_results = future.result()
+                    except (FetchError, CacheMissError) as err:
+                        self._add_failure(spec_data, str(err), getattr(err, "status_code", None))
+                        continue
+                    yield spec_data, io_results
+            finally:
+                # If the consumer stops early, don't start fetching characters nobody is waiting for.
+                for future in futures:
+                    future.cancel()
+                pbar.close()
+
+    def _iter_dump_results(
+        self, characters: List[Dict[str, str]], dump_fname: str
+    ) -> Iterator[Tuple[Dict[str, str], Dict[str, Any]]]:
+
+        # The roster characters are indexed by key, so matching a line of the dump is a single lookup.
+        remaining = {character_key(**spec_data): spec_data for spec_data in characters}
+
+        # Lines are matched to the roster before they're validated, so lines of characters that aren't in the roster
+        # are skipped without validating them.
+        def is_in_roster(data: Any) -> bool:
+            key = _get_dump_key(data)
+            return key is not None and key in remaining
+
+        # A bad line is skipped rather than failing the import. Its character (if in the roster) is then reported as
+        # missing from the dump.
+        def skip_invalid_line(err: DecodeError) -> None:
+            self._summary.number_invalid_lines += 1
+            if len(self._summary.invalid_lines) < MAX_REPORTED_INVALID_LINES:
+                self._summary.invalid_lines.append(str(err))
+
+        pbar = progress_bar(total=len(characters))
+        try:
+            for _, io_results in iter_dump(dump_fname, on_error=skip_invalid_line, select=is_in_roster):
+                key = character_key(io_results["realm"], io_results["name"], io_results["region"])
+                spec_data = remaining.pop(key)
+
+                io_results = self._field_selection.project(io_results)
+                if self._cache is not None:
+                    self._cache.set(
+                        spec_data["region"],
+                        spec_data["character_realm"],
+                        spec_data["character_name"],
+                        self._field_selection.cache_key,
+                        io_results,
+                    )
+                self._update_refresh_state(key, io_results)
 
                 pbar.update(1)
-        pbar.close()
-        return profiles
+                yield spec_data, io_results
+
+                # The rest of the dump is only read while some of the roster is still missing.
+                if not remaining:
+                    break
+        finally:
+            pbar.close()
+
+        self._instrumentation.increment("dump.invalid_lines", self._summary.number_invalid_lines)
+        for spec_data in remaining.values():
+            self._add_failure(spec_data, f"Not found in {dump_fname}")
+
+    def _add_failure(self, spec_data: Dict[str, str], reason: str, status_code: Optional[int] = None) -> None:
+
+        self._summary.failures.append(
+            FetchFailure(
+                region=spec_data["region"],
+                character_realm=spec_data["character_realm"],
+                character_name=spec_data["character_name"],
+                reason=reason,
+                status_code=status_code,
+            )
+        )
 
     def _format_io_results(
         self, io_results: Dict[str, Any], class_: str, spec: str, spec_data: Dict[str, str]
     ) -> Profile:
 
-        profile = Profile(
-            class_=class_,
-            spec=spec,
-            progression=self._get_progression(io_results),
-            score=self._get_score(io_results),
-            **spec_data,
-        )
+        # Attributes that weren't fetched are left empty.
+        with self._instrumentation.span("profile.format"):
+            profile = Profile(
+                class_=class_,
+                spec=spec,
+                progression=self._get_progression(io_results) if "progression" in self._field_selection else {},
+                score=self._get_score(io_results) if "score" in self._field_selection else 0.0,
+                **spec_data,
+            )
         return profile
 
     def _get_score(self, io_results: Dict[str, Any]) -> float:
-        return float(io_results["mythic_plus_scores"]["all"])
 
-    def _get_progression(self, io_results: Dict[str, Any]) -> Dict[str, Progression]:
+        score = io_results.get("mythic_plus_scores", {}).get("all")
+        if score is None:
+            raise DecodeError("The response has no `mythic_plus_scores.all`.")
+        return float(score)
+
+    def _get_progression(self, io_results: Dict[str, Any]) -> Mapping[str, Progression]:
+
+        # Every raid Raider IO returns is parsed, so a single fetch can be plotted for any of them.
+        progression = {
+            raid: self._get_raid_progression(raid_results)
+            for raid, raid_results in io_results.get("raid_progression", {}).items()
+        }
+        return progression
+
+    def _get_raid_progression(self, raid_results: Dict[str, Any]) -> Progression:
+
+        # Prefer the structured fields. Progression is reported at the hardest difficulty with a kill, matching the
+        # summary.
+        number_bosses = raid_results.get("total_bosses")
+        if number_bosses is not None:
+            available = [
+                (raid_results[key], difficulty) for key, difficulty in _DIFFICULTY_FIELDS if key in raid_results
+            ]
+            if available:
+                number_killed, difficulty = next(
+                    ((killed, difficulty) for killed, difficulty in available if killed > 0), available[-1]
+                )
+                return _make_progression(int(number_killed), int(number_bosses), difficulty)
 
         # TODO: Properly find an LFR example. Use Poormanrogue.
-        progress = io_results["raid_progression"][_RAID]["summary"]
-        difficulty = Difficulty[progress[-1]]
+        summary = raid_results.get("summary")
+        match = None if summary is None else RAID_SUMMARY_PATTERN.match(summary)
+        if match is None:
+            raise DecodeError(f"Could not parse raid summary {summary!r}.")
+
+        number_killed, number_bosses, difficulty = match.groups()
+        if difficulty not in Difficulty.__members__:
+            raise DecodeError(f"Unknown difficulty in raid summary {summary!r}.")
+        return _make_progression(int(number_killed), int(number_bosses), Difficulty[difficulty])
 
-        # Progress is in the form "<Num Bosses Killed>/<Num Bosses Available> <Difficulty letter>"
-        number_killed, number_bosses = progress[:-1].split("/")
-        progression = Progression(int(number_killed), int(number_bosses), difficulty)
+    def _fetch_character(self, spec_data: Dict[str, str]) -> Dict[str, Any]:
 
-        # FIXME: This should iterate over raids. Is it possible to scrape older raid data to see what the pattern will
-        # be?
-        return {_RAID: progression}
+        # The latency of each character as a whole, including any retries and time spent waiting on the rate limit.
+        with self._instrumentation.span("fetch.character"):
+            return self._fetch_io_results(**spec_data)
 
     def _fetch_io_results(self, character_realm: str, character_name: str, region: str, **kwargs) -> Dict[str, Any]:
 
         # TODO: Sanitize inputs to be in correct format (lower case etc).
 
-        # TODO: Allow ``fields`` to be customizable?
-        fields = "raid_progression,mythic_plus_scores"
-        response = requests.get(
-            f"{self._BASE_IO_URL}region={region}&realm={character_realm}&name={character_name}&fields={fields}"
-        )
-
-        # TODO: Invalid request handling.
-        return response.json()
-
-    def _load_data(self, fname: str) -> Dict[str, Any]:
-
-        with open(fname, "r") as f:
-            data = json.load(f)
-        return data
+        fields = self._field_selection.fields
+        cache_key = self._field_selection.cache_key
+        key = character_key(character_realm, character_name, region)
+
+        io_results = None
+        if self._cache is not None:
+            io_results = self._cache.get(
+                region, character_realm, character_name, cache_key, allow_expired=self._offline
+            )
+            self._instrumentation.increment("cache.misses" if io_results is None else "cache.hits")
+            if io_results is None and self._offline:
+                raise CacheMissError(f"No cached Raider IO response for {character_name}-{character_realm} ({region}).")
+
+        if io_results is None:
+            if self._refresh_state is not None:
+                io_results = self._get_unchanged_io_results(key, character_realm, character_name, region)
+            if io_results is None:
+                io_results = self._request_io_results(character_realm, character_name, region, fields)
+
+            # Only what the selected attributes use is kept, in the cache as well as the refresh state.
+            io_results = self._field_selection.project(io_results)
+            if self._cache is not None:
+                self._cache.set(region, character_realm, character_name, cache_key, io_results)
+
+        self._update_refresh_state(key, io_results)
+        return io_results
+
+    def _get_refresh_key(self, key: Tuple[str, str, str]) -> Tuple[str, ...]:
+
+        # Stored responses only hold the fields of the selection they were fetched with, so a response stored under
+        # one selection is never handed back to another.
+        return (*key, self._field_selection.cache_key)
+
+    def _update_refresh_state(self, key: Tuple[str, str, str], io_results: Dict[str, Any]) -> None:
+
+        if self._refresh_state is not None and self._refresh_state.update(self._get_refresh_key(key), io_results):
+            with self._summary_lock:
+                self._summary.number_changed += 1
+
+    def _get_unchanged_io_results(
+        self, key: Tuple[str, str, str], character_realm: str, character_name: str, region: str
+    ) -> Optional[Dict[str, Any]]:
+
+        # A request without any ``fields`` is a cheap probe that still tells us when the character was last crawled.
+        # If that's no later than the response we stored last time, the stored response is still current.
+        key = self._get_refresh_key(key)
+        if self._refresh_state.get(key) is None:
+            return None
+
+        try:
+            probe = self._request_io_results(character_realm, character_name, region, fields=None)
+        except FetchError:
+            return None
+
+        if not self._refresh_state.is_current(key, probe.get("last_crawled_at")):
+            return None
+
+        with self._summary_lock:
+            self._summary.number_unchanged += 1
+        self._instrumentation.increment("refresh.unchanged")
+        return self._refresh_state.get(key)
+
+    def _request_io_results(
+        self, character_realm: str, character_name: str, region: str, fields: Optional[str]
+    ) -> IOResponse:
+
+        url = f"{self._base_url}region={region}&realm={character_realm}&name={character_name}"
+        if fields is not None:
+            url = f"{url}&fields={fields}"
+
+        scheduler = self._get_scheduler()
+
+        def send() -> Any:
+            with self._instrumentation.span("fetch.http"):
+                return self._client.get(url)
+
+        response = scheduler.request(send)
+
+        if response.status_code != 200:
+            raise FetchError(self._get_error_message(response), status_code=response.status_code)
+
+        # A malformed response only fails this character, like any other failed fetch.
+        try:
+            with self._instrumentation.span("fetch.decode"):
+                return decode_response(response.content)
+        except DecodeError as err:
+            raise FetchError(f"Invalid Raider IO response: {err}", status_code=response.status_code) from err
+
+    def _get_error_message(self, response: Any) -> str:
+
+        # Raider IO describes the problem (e.g., "Could not find requested character") in the body of the response.
+        try:
+            body = loads(response.content)
+        except DecodeError:
+            body = None
+        message = body.get("message") if isinstance(body, dict) else None
+
+        if message is None:
+            return f"HTTP {response.status_code}"
+        return f"HTTP {response.status_code}: {message}"
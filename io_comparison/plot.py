@@ -1,38 +1,144 @@
-import re
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import io_comparison.settings as settings
 import matplotlib as mpl
 import matplotlib.image as mpimg
 import matplotlib.patches as patches
 import matplotlib.patheffects as path_effects
+from io_comparison.backend import use_default_backend
+
+use_default_backend()
+
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 import numpy as np
-from rich import print
+from io_comparison.console import print
 from io_comparison.generic import FloatRangeDict
-from io_comparison.player_profile import Profile
+from io_comparison.icons import IconStore, get_icon_store, snakify
+from io_comparison.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+from io_comparison.player_profile import Difficulty, Profile
 from io_comparison.plot_helper import PlotHelper, generate_plot_helper
-from io_comparison.utils import build_class_spec_inds, get_text_color
+from io_comparison.profile_table import ProfileTable
+from io_comparison.render_cache import RenderCache, copy_atomically
+from io_comparison.utils import CLASS_SPEC_PAIRS, CLASS_STYLE_TABLE, build_class_spec_inds
+from matplotlib.artist import Artist
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox, BboxTransformTo
 from matplotlib.ticker import FormatStrFormatter
 
 
+def _build_class_path_effects() -> Dict[str, List[path_effects.AbstractPathEffect]]:
+
+    # The outline drawn around the player strings on each class's bars. Path effects hold no per-artist state, so the
+    # same objects are shared by every text and every render.
+    return {
+        class_: [path_effects.Stroke(linewidth=0.5, foreground=style.outline_color), path_effects.Normal()]
+        for class_, style in CLASS_STYLE_TABLE.items()
+    }
+
+
+_CLASS_PATH_EFFECTS = _build_class_path_effects()
+
+
+def _update_digest(digest, value) -> None:
+
+    # Length prefixed, so consecutive values can't run into each other.
+    data = value.tobytes() if isinstance(value, np.ndarray) else repr(value).encode("utf-8")
+    digest.update(len(data).to_bytes(8, "little"))
+    digest.update(data)
+
+
+class _FigureTemplate:
+    """
+    A figure whose static layer (everything that doesn't depend on the profiles) has been rasterized once, ready to
+    have the profiles drawn on top.
+    """
+
+    def __init__(self, fig: Figure, ax, static_layer: Any) -> None:
+
+        self.fig = fig
+        self.ax = ax
+        self.static_layer = static_layer
+
+        # Artists making up the static layer. Those with a ``zorder`` of at least ``Plotter._PROFILE_ZORDER`` (e.g.,
+        # the spines) sit above the bars, so they're not part of the rasterized layer and are drawn for every plot.
+        self.static_artists = set(ax.get_children())
+
+        # The artists added for the most recent plot, removed before the next one.
+        self.profile_artists: List[Artist] = []
+
+
 class Plotter:
     """Not to be confused with the wizard."""
 
-    _ICON_DIR = Path(__file__).parent.joinpath("../data/icons")
     _ICON_SIZE = [20, 20]  # This depends on ``IMAGE_SIZE`` to make it look nice.
     _NUM_Y_TICKS = 6
     _FIGSIZE = (24, 24)
+    _ICON_LAYER_RESOLUTION = 2  # Pixels per data unit of the composited icon layer. Roughly the on-screen density.
+    _RENDER_VERSION = 3  # Part of every render cache key. Bump whenever a code change alters how plots look.
+    _PROFILE_ZORDER = 2  # Every artist drawn for the profiles (bars and up) sits at or above this ``zorder``.
+    _TEMPLATE_FORMATS = ("png",)  # Output formats a figure template can be saved in.
+    _MAX_TEMPLATES = 1  # Each template holds a rasterized figure (~45 MB at the default size), so only one is kept.
+
+    def __init__(
+        self,
+        plot_helper: Optional[PlotHelper] = None,
+        icons: Optional[IconStore] = None,
+        render_cache: Optional[RenderCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        reuse_figures: bool = True,
+    ) -> None:
+        """
+        plot_helper : ``PlotHelper``, optional
+            Controls the figure size and where and in which format plots are saved.
+
+        icons : ``IconStore``, optional
+            The class and spec icons. Defaults to the store shared by the whole process.
+
+        render_cache : ``RenderCache``, optional
+            If specified, a plot whose inputs are identical to a previous one is copied from the cache rather than
+            rendered again.
+
+        instrumentation : ``Instrumentation``, optional
+            If specified, the time spent loading icons, creating each group of artists and saving (rasterizing and
+            encoding) the figure is recorded. Nothing is recorded by default.
+
+        reuse_figures : bool, optional
+            If set, the parts of the figure that don't depend on the profiles (the axis, grid, class icons and
+            background) are rasterized once per background and reused by every later plot, so only the profiles are
+            drawn for each plot. Only applies to PNG output; other formats are always drawn in full. A background
+            image must not be modified in place once it has been plotted. The most recent template is kept until
+            ``clear_templates`` is called.
+        """
 
-    def __init__(self, plot_helper: Optional[PlotHelper] = None) -> None:
-        self._icons: Dict[str, str] = self._get_icons()
+        # Icons are decoded lazily and shared between every ``Plotter`` in the process.
+        if icons is None:
+            icons = get_icon_store()
+        self._icons = icons
 
         if plot_helper is None:
             plot_helper = generate_plot_helper(figsize=self._FIGSIZE)
         self._plot_helper = plot_helper
+        self._render_cache = render_cache
+
+        if instrumentation is None:
+            instrumentation = NULL_INSTRUMENTATION
+        self._instrumentation = instrumentation
         self._class_spec_inds = build_class_spec_inds()
+
+        # Figure templates keyed by ``_get_template_key``, least recently used first. A template is only ever drawn
+        # by one thread at a time.
+        self._reuse_figures = reuse_figures
+        self._templates: "OrderedDict[str, _FigureTemplate]" = OrderedDict()
+        self._template_lock = threading.Lock()
+        self._background_digests: Dict[int, Tuple[weakref.ref, str]] = {}
         self._progression_colors = FloatRangeDict(
             {
                 (0, 0.5): "k",  # Black.
@@ -41,35 +147,23 @@ class Plotter:
                 (0.9, 1.01): "#FFD700",  # Gold.
             }
         )
-        self._rio_icon = mpimg.imread(f"{self._ICON_DIR}/raider_io.png")
-
-    def _snakify(self, text: str) -> str:
-        x = re.sub(r"[^a-zA-Z0-9\s\-\_]", "", text.lower())
-        return re.sub(r"\W", "_", x)
-
-    def _get_icons(self) -> Dict[str, str]:
 
-        # FIXME: Specify type.
-        icons: Dict[Tuple[str, Optional[str]], Any] = {}
-        for class_, specs in settings.CLASSES_SPECS.items():
-
-            class_name = self._snakify(class_)
-            icons[(class_name, None)] = mpimg.imread(f"{self._ICON_DIR}/{class_name}.jpg")
-
-            for spec in specs:
-                spec_name = self._snakify(spec)
-                icons[(class_name, spec_name)] = mpimg.imread(f"{self._ICON_DIR}/{class_name}_{spec_name}.jpg")
+        # Maps the unit square onto the axis limits; equivalent to ``ax.transLimits.inverted()`` for every plot, but
+        # built once rather than inverted per profile.
+        axis_limits = Bbox.from_extents(0, 0, settings.IMAGE_SIZE, settings.IMAGE_SIZE)
+        self._rel_to_data = BboxTransformTo(axis_limits)
 
-        return icons
+    @property
+    def _rio_icon(self) -> np.ndarray:
+        return self._icons["raider_io"]
 
-    def _get_x_coord(self, class_: str, spec: str) -> float:
-        inds_info = self._class_spec_inds[class_][spec]
+    def _snakify(self, text: str) -> str:
+        return snakify(text)
 
-        # Add a small amount of padding.
-        rel_x = (inds_info.global_idx) / (inds_info.num_global)
-        return rel_x
+    def _get_x_coord(self, global_inds: np.ndarray) -> np.ndarray:
+        return global_inds / len(CLASS_SPEC_PAIRS)
 
-    def _get_y_coord(self, score: float) -> float:
+    def _get_y_coord(self, score: np.ndarray) -> np.ndarray:
 
         # The maximum IO score will be placed at ``IMAGE_SIZE``.
         # Hence, when ``score`` == ``MAX_IO``, then this needs to return 1.
@@ -128,75 +222,150 @@ class Plotter:
         ax.tick_params(axis="y", which="both", length=10, width=5)
         ax.spines["left"].set_linewidth(5)
 
-    def _add_bar(self, profile: Profile, icon_coords: Tuple[float, float], ax) -> None:
-
-        x_bar = icon_coords[0] + self._ICON_SIZE[0] / 4
-        y_bar = 0
-        color = settings.CLASS_COLORS[profile.class_]
-        rect = patches.Rectangle(
-            (x_bar, y_bar),
-            width=self._ICON_SIZE[0] / 2,
-            height=icon_coords[1],
-            linewidth=1,
-            color=color,
-            zorder=2,
-        )
-        ax.add_patch(rect)
-
-        if profile.score < 400:
-            y_text = 1
-            text_size = 8
-        else:
-            y_text = icon_coords[1] / 4
-            text_size = 14
-
-        x_text = icon_coords[0] + self._ICON_SIZE[0] / 4
+    def _add_bars(self, profiles: ProfileTable, icon_coords: np.ndarray, ax) -> None:
 
-        text = profile.get_player_string()
-        text_color, outline_color = get_text_color(color)
+        # All bars are drawn as a single collection. Each bar runs from the bottom of the axis up to its icon.
+        x_bars = icon_coords[:, 0] + self._ICON_SIZE[0] / 4
+        y_bars = icon_coords[:, 1]
+        classes = profiles.get_classes()
+        colors = [CLASS_STYLE_TABLE[class_].color for class_ in classes]
 
-        text = ax.text(x_text, y_text, text, rotation=90, size=text_size, color=text_color, zorder=2)
-        text.set_path_effects([path_effects.Stroke(linewidth=0.5, foreground=outline_color), path_effects.Normal()])
-
-    def _add_icon(self, profile: Profile, coords: Tuple[float, float], ax) -> None:
-
-        x, y = coords
-        extent = (x, x + self._ICON_SIZE[0], y, y + self._ICON_SIZE[1])
-        imgplot = ax.imshow(self._icons[(profile.class_, profile.spec)], extent=extent, zorder=4)
+        bars = PolyCollection(
+            self._get_rectangle_verts(x_bars, np.zeros_like(y_bars), self._ICON_SIZE[0] / 2, y_bars),
+            facecolors=colors,
+            edgecolors=colors,
+            linewidths=1,
+            zorder=2,
+        )
+        ax.add_collection(bars)
 
-    def _get_progression_color(self, profile: Profile) -> str:
+        for text, score, class_, (x, y) in zip(profiles.get_player_strings(), profiles.score, classes, icon_coords):
 
-        progression = profile.progression[settings.CURRENT_RAID]
+            if score < 400:
+                y_text = 1
+                text_size = 8
+            else:
+                y_text = y / 4
+                text_size = 14
+
+            x_text = x + self._ICON_SIZE[0] / 4
+
+            text_color = CLASS_STYLE_TABLE[class_].text_color
+            text = ax.text(x_text, y_text, text, rotation=90, size=text_size, color=text_color, zorder=2)
+            text.set_path_effects(_CLASS_PATH_EFFECTS[class_])
+
+    def _get_rectangle_verts(
+        self, x: np.ndarray, y: np.ndarray, width: float, height: np.ndarray
+    ) -> np.ndarray:
+
+        # Corners of each rectangle, going anti-clockwise from the bottom left. Shape is (N, 4, 2).
+        x_corners = np.stack([x, x + width, x + width, x], axis=-1)
+        y_corners = np.stack([y, y, y + height, y + height], axis=-1)
+        return np.stack([x_corners, y_corners], axis=-1)
+
+    def _get_layer_icon(self, icon: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+
+        # Icons are composited as 8-bit RGBA. JPGs are decoded as RGB ``uint8`` while PNGs are RGBA floats.
+        if icon.dtype != np.uint8:
+            icon = (np.clip(icon, 0, 1) * 255).astype(np.uint8)
+        if icon.shape[2] == 3:
+            icon = np.dstack([icon, np.full(icon.shape[:2], 255, dtype=np.uint8)])
+
+        # Nearest neighbour resample to the icon's size on the layer. The layer is drawn with ``origin="lower"`` so the
+        # icon is also flipped vertically.
+        rows = (np.arange(shape[0]) * icon.shape[0] / shape[0]).astype(int)
+        cols = (np.arange(shape[1]) * icon.shape[1] / shape[1]).astype(int)
+        return icon[rows[::-1]][:, cols]
+
+    def _add_icons(self, profiles: ProfileTable, coords: np.ndarray, ax) -> None:
+
+        # Rather than one ``imshow`` per profile, every icon is blitted into a single transparent RGBA layer which is
+        # then drawn once. The layer only spans the region the icons occupy, rather than the whole axis.
+        if len(coords) == 0:
+            return
+
+        resolution = self._ICON_LAYER_RESOLUTION
+        axis_size = int(settings.IMAGE_SIZE * resolution)
+        icon_shape = (int(round(self._ICON_SIZE[1] * resolution)), int(round(self._ICON_SIZE[0] * resolution)))
+
+        # Icons near the top of the axis are clipped, just as they would be by the axis itself.
+        rows = np.round(coords[:, 1] * resolution).astype(int)
+        cols = np.round(coords[:, 0] * resolution).astype(int)
+        row_offset, row_end = max(rows.min(), 0), min(rows.max() + icon_shape[0], axis_size)
+        col_offset, col_end = max(cols.min(), 0), min(cols.max() + icon_shape[1], axis_size)
+        if row_offset >= row_end or col_offset >= col_end:
+            return
+        layer = np.zeros((row_end - row_offset, col_end - col_offset, 4), dtype=np.uint8)
+
+        layer_icons: Dict[Tuple[str, str], np.ndarray] = {}
+        for key, row, col in zip(profiles.get_class_specs(), rows, cols):
+
+            if key not in layer_icons:
+                with self._instrumentation.span("plot.icons.load"):
+                    layer_icons[key] = self._get_layer_icon(self._icons[key], icon_shape)
+            icon = layer_icons[key]
+
+            row_low, row_high = max(row, row_offset), min(row + icon_shape[0], row_end)
+            col_low, col_high = max(col, col_offset), min(col + icon_shape[1], col_end)
+            if row_low >= row_high or col_low >= col_high:
+                continue
+
+            icon_rows = slice(row_low - row, row_high - row)
+            icon_cols = slice(col_low - col, col_high - col)
+            layer[row_low - row_offset : row_high - row_offset, col_low - col_offset : col_high - col_offset] = icon[
+                icon_rows, icon_cols
+            ]
+
+        image_extent = [col_offset / resolution, col_end / resolution, row_offset / resolution, row_end / resolution]
+        ax.imshow(layer, extent=image_extent, origin="lower", zorder=4)
+
+    def _get_progression_colors(self, profiles: ProfileTable) -> np.ndarray:
 
         # TODO: Add check for difficulty to ensure its Mythic.
-        fraction_progress = progression.number_killed / progression.number_bosses
-        color = self._progression_colors[fraction_progress]
-        return color
-
-    def _add_progression(self, profile: Profile, icon_coords: Tuple[float, float], ax) -> None:
-
-        x_box = icon_coords[0] - self._ICON_SIZE[0] * 0.16
-        y_box = icon_coords[1] - self._ICON_SIZE[1] * 0.155
-
-        color = self._get_progression_color(profile)
-
-        rect = patches.Rectangle(
-            (x_box, y_box),
-            width=self._ICON_SIZE[0] * 1.3,
-            height=self._ICON_SIZE[1] * 1.3,
-            linewidth=1,
-            color=color,
+        return self._progression_colors.lookup_many(profiles.get_progression_fraction())
+
+    def _add_progressions(self, profiles: ProfileTable, icon_coords: np.ndarray, ax) -> None:
+
+        # The progression boxes sit behind the icons, forming a coloured border. Drawn as a single collection.
+        x_boxes = icon_coords[:, 0] - self._ICON_SIZE[0] * 0.16
+        y_boxes = icon_coords[:, 1] - self._ICON_SIZE[1] * 0.155
+        colors = list(self._get_progression_colors(profiles))
+
+        boxes = PolyCollection(
+            self._get_rectangle_verts(
+                x_boxes, y_boxes, self._ICON_SIZE[0] * 1.3, np.full_like(y_boxes, self._ICON_SIZE[1] * 1.3)
+            ),
+            facecolors=colors,
+            edgecolors=colors,
+            linewidths=1,
             zorder=3,
         )
-        ax.add_patch(rect)
+        ax.add_collection(boxes)
 
     def _add_background(self, ax, image) -> None:
         ax.set_facecolor("black")
 
+        if image is None:
+            return
+
         image_extent = [0, settings.IMAGE_SIZE, 0, settings.IMAGE_SIZE]
         ax.imshow(image, extent=image_extent, alpha=0.5)
 
-    def _add_legend(self, ax) -> None:
+    def _get_number_bosses(self, profiles: ProfileTable) -> int:
+
+        number_bosses = settings.RAID_BOSSES.get(profiles.raid)
+        if number_bosses is None:
+            number_bosses = int(profiles.number_bosses.max(initial=0))
+        return number_bosses
+
+    def _add_legend(self, ax, number_bosses: int, difficulty: Optional[Difficulty]) -> None:
+
+        # Without a boss count (an unknown raid nobody has progressed in) there's nothing meaningful to label.
+        if number_bosses == 0:
+            return
+
+        # The progression shown is each profile's hardest difficulty with a kill, labelled with the hardest of those.
+        difficulty_label = "" if difficulty is None else difficulty.name
 
         rectangles = []
         labels = []
@@ -207,17 +376,76 @@ class Plotter:
             rectangles.append(rect)
 
             if np.isclose(progression_fraction[0], 0.0):
-                label = f"<{int(progression_fraction[1] * settings.CURRENT_RAID_BOSSES)}/{settings.CURRENT_RAID_BOSSES}M"
+                label = f"<{int(progression_fraction[1] * number_bosses)}/{number_bosses}{difficulty_label}"
             else:
-                label = f"{int(progression_fraction[1] * settings.CURRENT_RAID_BOSSES)}/{settings.CURRENT_RAID_BOSSES}M"
+                label = f"{int(progression_fraction[1] * number_bosses)}/{number_bosses}{difficulty_label}"
             labels.append(label)
 
         ax.legend(rectangles, labels)
 
-    def plot_profiles(self, profiles: List[Profile], output_fname: str, background_image) -> None:
+    def get_placements(self, profiles: Union[List[Profile], ProfileTable]) -> np.ndarray:
+        """
+        Returns the (x, y) data coordinates of the icon (bottom left corner) of every profile, in the same order as
+        ``profiles``. This is exactly where ``plot_profiles`` places them, so it can be used for hit-testing or exports
+        without rendering.
+        """
 
-        print(f"Plotting scores for [bold magenta]{len(profiles)}[/] characters.")
+        if not isinstance(profiles, ProfileTable):
+            profiles = ProfileTable.from_profiles(profiles, raid=settings.CURRENT_RAID)
+
+        # Every profile is placed in one vectorized step: relative (x, y) positions in the unit square are mapped onto
+        # the axis limits with a single transform.
+        rel_coords = np.column_stack([self._get_x_coord(profiles.global_inds), self._get_y_coord(profiles.score)])
+        return self._rel_to_data.transform(rel_coords)
+
+    def get_render_key(self, profiles: ProfileTable, background_image=None) -> str:
+        """
+        Returns a hash of everything a plot of ``profiles`` depends on: the plotted columns of every profile (in order),
+        the values in ``settings``, the ``background_image`` and the ``PlotHelper`` options. Profile fields that aren't
+        drawn (e.g., guild and notes) don't affect the key.
+        """
+
+        digest = hashlib.blake2b(digest_size=20)
+
+        def update(value) -> None:
+            _update_digest(digest, value)
+
+        update((self._RENDER_VERSION, mpl.__version__, profiles.raid))
+        for column in [
+            profiles.global_inds,
+            profiles.score,
+            profiles.number_killed,
+            profiles.number_bosses,
+            profiles.difficulty,
+            profiles.special,
+        ]:
+            update(column.dtype.str)
+            update(column)
+        update(profiles.get_player_strings())
+
+        update(sorted((name, value) for name, value in vars(settings).items() if name.isupper()))
+        update(
+            (
+                self._plot_helper.figsize,
+                self._plot_helper.output_format,
+                self._plot_helper.usetex,
+                self._ICON_SIZE,
+                self._NUM_Y_TICKS,
+                self._ICON_LAYER_RESOLUTION,
+            )
+        )
+
+        # Shared with the figure templates, so a background is only hashed once for as long as it's alive.
+        update(self._get_background_digest(background_image))
+
+        return digest.hexdigest()
+
+    def get_output_file(self, output_fname: str) -> str:
+        return f"{self._plot_helper.output_path}/{output_fname}.{self._plot_helper.output_format}"
 
+    def _draw_figure(self, profiles: ProfileTable, background_image=None) -> Tuple[plt.Figure, np.ndarray]:
+
+        # Only builds the artists; nothing is rasterized until the figure is drawn (e.g., by ``_save_figure``).
         fig = plt.figure(figsize=self._plot_helper.figsize)
         ax = fig.add_subplot(111)
 
@@ -225,22 +453,261 @@ class Plotter:
         ax.set_ylim(0, settings.IMAGE_SIZE)
         ax.set_ylabel(f"Raider IO Score")
 
-        for profile in profiles:
+        # Made equal by the ``imshow`` of the icon layer or background too, but neither is drawn for an empty roster
+        # without a background. Set up front so every plot (and every figure template) has the same axis.
+        ax.set_aspect("equal")
+
+        with self._instrumentation.span("plot.placements"):
+            coords = self.get_placements(profiles)
+
+        # Icon loading is recorded separately, within the icon artists.
+        with self._instrumentation.span("plot.artists.icons"):
+            self._add_icons(profiles, coords, ax)
+        with self._instrumentation.span("plot.artists.bars"):
+            self._add_bars(profiles, coords, ax)
+        with self._instrumentation.span("plot.artists.progressions"):
+            self._add_progressions(profiles, coords, ax)
+
+        with self._instrumentation.span("plot.artists.axis"):
+            self._plot_class_icons(fig, ax)
+            self._adjust_axis(ax)
+            self._add_background(ax, background_image)
+            self._add_legend(ax, self._get_number_bosses(profiles), profiles.get_hardest_difficulty())
+
+        return fig, coords
+
+    def _save_figure(self, fig: plt.Figure, output_file: str) -> None:
+
+        # Save to a temporary file and move it into place, so anything watching ``output_file`` (e.g., a dashboard
+        # showing incremental snapshots) never sees a partially written image.
+        partial_file = f"{output_file}.partial"
+        with self._instrumentation.span("plot.savefig"):
+            fig.savefig(partial_file, pad_inches=0, format=self._plot_helper.output_format)
+        os.replace(partial_file, output_file)
+        plt.close(fig)
+
+    def _get_background_digest(self, background_image) -> Optional[str]:
+
+        if background_image is None:
+            return None
+
+        # Hashing a background takes longer than drawing the static layer it selects, so the digest is remembered for
+        # as long as the background array is alive.
+        remembered = self._background_digests.get(id(background_image))
+        if remembered is not None and remembered[0]() is background_image:
+            return remembered[1]
+
+        digest = hashlib.blake2b(digest_size=20)
+        background = np.ascontiguousarray(background_image)
+        _update_digest(digest, (background.shape, background.dtype.str))
+        _update_digest(digest, background)
+        background_digest = digest.hexdigest()
+
+        key = id(background_image)
+        try:
+            reference = weakref.ref(background_image, lambda _: self._background_digests.pop(key, None))
+        except TypeError:
+            # Can't be referenced weakly (e.g., a nested list), so it's hashed again on every plot.
+            return background_digest
+        self._background_digests[key] = (reference, background_digest)
+        return background_digest
+
+    def _get_template_key(self, background_image=None) -> str:
+
+        # Everything the static layer depends on. Unlike ``get_render_key``, nothing about the profiles.
+        digest = hashlib.blake2b(digest_size=20)
+        _update_digest(digest, (self._RENDER_VERSION, mpl.__version__))
+        _update_digest(digest, sorted((name, value) for name, value in vars(settings).items() if name.isupper()))
+        _update_digest(digest, (self._plot_helper.figsize, self._plot_helper.usetex, self._NUM_Y_TICKS))
+        _update_digest(digest, self._get_background_digest(background_image))
+        return digest.hexdigest()
+
+    def _build_template(self, background_image=None) -> _FigureTemplate:
+
+        # Not created through ``pyplot``, so the figure isn't tracked (or closed) along with the figures it manages.
+        fig = Figure(figsize=self._plot_helper.figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
 
-            x_coord = self._get_x_coord(profile.class_, profile.spec)
-            y_coord = self._get_y_coord(profile.score)
-            x, y = ax.transLimits.inverted().transform((x_coord, y_coord))
+        ax.set_xlim(0, settings.IMAGE_SIZE)
+        ax.set_ylim(0, settings.IMAGE_SIZE)
+        ax.set_ylabel(f"Raider IO Score")
 
-            self._add_icon(profile, (x, y), ax)
-            self._add_bar(profile, (x, y), ax)
-            self._add_progression(profile, (x, y), ax)
+        # The ``imshow`` of the icon layer makes the aspect equal (moving the axis) before the class icons are placed
+        # relative to the axis, so the same must happen here.
+        ax.set_aspect("equal")
 
         self._plot_class_icons(fig, ax)
         self._adjust_axis(ax)
         self._add_background(ax, background_image)
-        self._add_legend(ax)
 
-        output_file = f"{self._plot_helper.output_path}/{output_fname}.{self._plot_helper.output_format}"
-        fig.savefig(output_file, pad_inches=0)
+        # Artists above the bars are hidden while the static layer is rasterized, as they're drawn over the profiles.
+        overlay = [artist for artist in ax.get_children() if artist.get_zorder() >= self._PROFILE_ZORDER]
+        visible = [artist.get_visible() for artist in overlay]
+        for artist in overlay:
+            artist.set_visible(False)
+
+        fig.canvas.draw()
+        static_layer = fig.canvas.copy_from_bbox(fig.bbox)
+
+        for artist, was_visible in zip(overlay, visible):
+            artist.set_visible(was_visible)
+
+        return _FigureTemplate(fig, ax, static_layer)
+
+    def _get_template(self, background_image=None) -> _FigureTemplate:
+
+        key = self._get_template_key(background_image)
+        template = self._templates.get(key)
+        if template is None:
+            with self._instrumentation.span("plot.template.build"):
+                template = self._build_template(background_image)
+            self._templates[key] = template
+            while len(self._templates) > self._MAX_TEMPLATES:
+                self._templates.popitem(last=False)
+        self._templates.move_to_end(key)
+        return template
+
+    def clear_templates(self) -> None:
+        """
+        Frees the figure templates kept for ``reuse_figures``, e.g., once a long-running process is done plotting for
+        a while. They're rebuilt by the next plot.
+        """
+
+        with self._template_lock:
+            self._templates.clear()
+
+    def _draw_from_template(self, profiles: ProfileTable, background_image, output_file: str) -> np.ndarray:
+
+        with self._template_lock:
+            template = self._get_template(background_image)
+            ax = template.ax
+
+            for artist in template.profile_artists:
+                artist.remove()
+
+            with self._instrumentation.span("plot.placements"):
+                coords = self.get_placements(profiles)
+
+            # The same artists as ``_draw_figure`` adds for the profiles, in the same order.
+            with self._instrumentation.span("plot.artists.icons"):
+                self._add_icons(profiles, coords, ax)
+            with self._instrumentation.span("plot.artists.bars"):
+                self._add_bars(profiles, coords, ax)
+            with self._instrumentation.span("plot.artists.progressions"):
+                self._add_progressions(profiles, coords, ax)
+            with self._instrumentation.span("plot.artists.axis"):
+                self._add_legend(ax, self._get_number_bosses(profiles), profiles.get_hardest_difficulty())
+
+            children = ax.get_children()
+            template.profile_artists = [artist for artist in children if artist not in template.static_artists]
+
+            # Restore the static layer, then draw everything above it in the order ``Axes.draw`` would (a stable sort
+            # on ``zorder``). The pixels match drawing the whole figure from scratch.
+            partial_file = f"{output_file}.partial"
+            with self._instrumentation.span("plot.savefig"):
+                canvas = template.fig.canvas
+                canvas.restore_region(template.static_layer)
+                renderer = canvas.get_renderer()
+
+                layer = [
+                    artist
+                    for artist in children
+                    if artist.get_visible()
+                    and (artist not in template.static_artists or artist.get_zorder() >= self._PROFILE_ZORDER)
+                ]
+                for artist in sorted(layer, key=lambda artist: artist.get_zorder()):
+                    artist.draw(renderer)
+
+                mpimg.imsave(
+                    partial_file,
+                    np.asarray(canvas.buffer_rgba()),
+                    format=self._plot_helper.output_format,
+                    dpi=template.fig.dpi,
+                )
+            os.replace(partial_file, output_file)
+
+        return coords
+
+    def plot_profiles(
+        self,
+        profiles: Union[List[Profile], ProfileTable],
+        output_fname: str,
+        background_image=None,
+        raid: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Plots ``profiles`` and saves the figure. Returns the placement of every profile (see ``get_placements``).
+
+        The progression shown is for ``raid`` (defaults to ``settings.CURRENT_RAID``). Profiles hold the progression of
+        every raid Raider IO returned, so the same profiles can be plotted for several raids without refetching. A
+        ``ProfileTable`` only holds a single raid and must match ``raid``.
+        """
+
+        if raid is None:
+            raid = profiles.raid if isinstance(profiles, ProfileTable) else settings.CURRENT_RAID
+
+        # Everything is plotted from the columnar table, so a list is converted once up front.
+        if not isinstance(profiles, ProfileTable):
+            with self._instrumentation.span("plot.table"):
+                profiles = ProfileTable.from_profiles(profiles, raid=raid)
+        elif profiles.raid != raid:
+            raise ValueError(f"The table holds progression for {profiles.raid!r}, not {raid!r}.")
+
+        output_file = self.get_output_file(output_fname)
+        output_format = self._plot_helper.output_format
+        if self._render_cache is not None:
+            with self._instrumentation.span("plot.render_cache"):
+                render_key = self.get_render_key(profiles, background_image)
+                cached_file = self._render_cache.get(render_key, output_format)
+            self._instrumentation.increment("render_cache.misses" if cached_file is None else "render_cache.hits")
+            if cached_file is not None:
+                copy_atomically(cached_file, output_file)
+                print(f"Plot is unchanged; reused [bold magenta]{output_file}[/]")
+                return self.get_placements(profiles)
+
+        print(f"Plotting scores for [bold magenta]{len(profiles)}[/] characters.")
+
+        if self._reuse_figures and output_format in self._TEMPLATE_FORMATS:
+            coords = self._draw_from_template(profiles, background_image, output_file)
+        else:
+            fig, coords = self._draw_figure(profiles, background_image)
+            self._save_figure(fig, output_file)
         print(f"Saved file to [bold magenta]{output_file}[/]")
-        plt.close()
+
+        if self._render_cache is not None:
+            self._render_cache.set(render_key, output_format, output_file)
+
+        return coords
+
+    def plot_profiles_incrementally(
+        self,
+        profiles: Iterable[Profile],
+        output_fname: str,
+        background_image=None,
+        snapshot_every: int = 1,
+        raid: Optional[str] = None,
+    ) -> List[Profile]:
+        """
+        Consumes ``profiles`` one at a time (e.g., from ``ProfileHandler.iter_player_profiles``), re-rendering a
+        snapshot of every profile received so far after each ``snapshot_every`` new profiles, and once more at the end.
+        Each snapshot replaces the previous one at the same output file.
+
+        Returns all of the profiles that were plotted.
+        """
+
+        if snapshot_every < 1:
+            raise ValueError(f"`snapshot_every` must be at least 1. Received {snapshot_every}.")
+
+        received: List[Profile] = []
+        number_plotted = 0
+        for profile in profiles:
+            received.append(profile)
+            if len(received) - number_plotted >= snapshot_every:
+                self.plot_profiles(received, output_fname, background_image, raid)
+                number_plotted = len(received)
+
+        if number_plotted != len(received) or not received:
+            self.plot_profiles(received, output_fname, background_image, raid)
+
+        return received
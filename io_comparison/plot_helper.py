@@ -2,6 +2,11 @@ import os
 from typing import Dict, List, Optional, Union
 
 import matplotlib
+
+from io_comparison.backend import use_default_backend
+
+use_default_backend()
+
 import matplotlib.pyplot as plt
 
 
@@ -161,7 +166,7 @@ class PlotHelper():
         """
 
         legend = ax.legend(loc=location)
-        handles = legend.legendHandles
+        handles = legend.legend_handles
 
         legend.draw_frame(False)
 
@@ -0,0 +1,203 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import io_comparison.settings as settings
+from io_comparison.player_profile import Difficulty, Profile, Progression, format_player_string
+from io_comparison.utils import CLASS_SPEC_PAIRS, get_global_inds
+
+# Difficulties are stored as their position in ``Difficulty``. Missing progression is stored as -1.
+_DIFFICULTIES = list(Difficulty)
+_NO_DIFFICULTY = -1
+
+# Columns holding strings. Each is stored as integer codes into a pool of its unique values.
+_STRING_COLUMNS = ["player_handle", "character_name", "character_realm", "region", "guild", "notes"]
+
+
+def _intern(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, Tuple[Optional[str], ...]]:
+
+    pool: Dict[Optional[str], int] = {}
+    codes = np.fromiter((pool.setdefault(value, len(pool)) for value in values), dtype=np.int32, count=len(values))
+    return codes, tuple(pool)
+
+
+class ProfileTable:
+    """
+    A columnar store of profiles for a single raid.
+
+    Numeric fields are NumPy arrays, the class and spec are stored as their global index (see ``CLASS_SPEC_TABLE``) and
+    every string field is stored as codes into a pool of its unique values. A table is much smaller than the equivalent
+    ``List[Profile]`` for large rosters and can be sorted and filtered without touching Python objects per row.
+
+    Only the progression of ``raid`` is kept, so converting back with ``to_profiles`` drops any other raids.
+    """
+
+    def __init__(
+        self,
+        raid: str,
+        global_inds: np.ndarray,
+        score: np.ndarray,
+        number_killed: np.ndarray,
+        number_bosses: np.ndarray,
+        difficulty: np.ndarray,
+        special: np.ndarray,
+        string_codes: Dict[str, np.ndarray],
+        string_pools: Dict[str, Tuple[Optional[str], ...]],
+    ) -> None:
+
+        self._raid = raid
+        self.global_inds = global_inds
+        self.score = score
+        self.number_killed = number_killed
+        self.number_bosses = number_bosses
+        self.difficulty = difficulty
+        self.special = special
+        self._string_codes = string_codes
+        self._string_pools = string_pools
+
+    @classmethod
+    def from_profiles(cls, profiles: Sequence[Profile], raid: str = settings.CURRENT_RAID) -> "ProfileTable":
+
+        global_inds = get_global_inds([profile.class_ for profile in profiles], [profile.spec for profile in profiles])
+        score = np.fromiter((profile.score for profile in profiles), dtype=np.float64, count=len(profiles))
+
+        progressions = [profile.progression.get(raid) for profile in profiles]
+        number_killed = np.array([0 if p is None else p.number_killed for p in progressions], dtype=np.int16)
+        number_bosses = np.array([0 if p is None else p.number_bosses for p in progressions], dtype=np.int16)
+        difficulty = np.array(
+            [_NO_DIFFICULTY if p is None else _DIFFICULTIES.index(p.difficulty) for p in progressions], dtype=np.int8
+        )
+        special = np.array([profile.special for profile in profiles], dtype=bool)
+
+        string_codes = {}
+        string_pools = {}
+        for column in _STRING_COLUMNS:
+            string_codes[column], string_pools[column] = _intern([getattr(profile, column) for profile in profiles])
+
+        return cls(
+            raid,
+            global_inds.astype(np.int16),
+            score,
+            number_killed,
+            number_bosses,
+            difficulty,
+            special,
+            string_codes,
+            string_pools,
+        )
+
+    def to_profiles(self) -> List[Profile]:
+
+        columns = {column: self.get_strings(column) for column in _STRING_COLUMNS}
+
+        profiles = []
+        for idx in range(len(self)):
+            class_, spec = CLASS_SPEC_PAIRS[self.global_inds[idx]]
+
+            progression = {}
+            if self.difficulty[idx] != _NO_DIFFICULTY:
+                progression[self._raid] = Progression(
+                    int(self.number_killed[idx]),
+                    int(self.number_bosses[idx]),
+                    _DIFFICULTIES[self.difficulty[idx]],
+                )
+
+            profiles.append(
+                Profile(
+                    class_=class_,
+                    spec=spec,
+                    score=float(self.score[idx]),
+                    progression=progression,
+                    special=bool(self.special[idx]),
+                    **{column: values[idx] for column, values in columns.items()},
+                )
+            )
+
+        return profiles
+
+    @property
+    def raid(self) -> str:
+        """
+        str : the raid whose progression is stored.
+        """
+        return self._raid
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    def get_strings(self, column: str) -> List[Optional[str]]:
+        """
+        Returns the values of the string ``column`` (e.g., ``"character_name"``) for every row.
+        """
+        pool = self._string_pools[column]
+        return [pool[code] for code in self._string_codes[column]]
+
+    def get_classes(self) -> List[str]:
+        return [CLASS_SPEC_PAIRS[idx][0] for idx in self.global_inds]
+
+    def get_class_specs(self) -> List[Tuple[str, str]]:
+        return [CLASS_SPEC_PAIRS[idx] for idx in self.global_inds]
+
+    def get_player_strings(self) -> List[str]:
+
+        # Formatted once per unique (handle, name, realm, special) combination.
+        keys = zip(
+            self._string_codes["player_handle"],
+            self._string_codes["character_name"],
+            self._string_codes["character_realm"],
+            self.special,
+        )
+
+        formatted: Dict[Tuple[int, int, int, bool], str] = {}
+        strings = []
+        for key in keys:
+            if key not in formatted:
+                handle, name, realm, special = key
+                formatted[key] = format_player_string(
+                    self._string_pools["player_handle"][handle],
+                    self._string_pools["character_name"][name],
+                    self._string_pools["character_realm"][realm],
+                    bool(special),
+                )
+            strings.append(formatted[key])
+
+        return strings
+
+    def get_progression_fraction(self) -> np.ndarray:
+        """
+        Returns the fraction of bosses killed by each row. Rows without any progression for ``raid`` are 0.
+        """
+        return self.number_killed / np.maximum(self.number_bosses, 1)
+
+    def get_hardest_difficulty(self) -> Optional[Difficulty]:
+        """
+        Returns the hardest difficulty any row has progression at, or ``None`` if no row has progression for ``raid``.
+        """
+        difficulties = self.difficulty[self.difficulty != _NO_DIFFICULTY]
+        if len(difficulties) == 0:
+            return None
+        return _DIFFICULTIES[difficulties.min()]
+
+    def take(self, inds: np.ndarray) -> "ProfileTable":
+        """
+        Returns a new table with the rows ``inds`` (either integer indices or a boolean mask). The string pools are
+        shared with this table.
+        """
+
+        return ProfileTable(
+            self._raid,
+            self.global_inds[inds],
+            self.score[inds],
+            self.number_killed[inds],
+            self.number_bosses[inds],
+            self.difficulty[inds],
+            self.special[inds],
+            {column: codes[inds] for column, codes in self._string_codes.items()},
+            self._string_pools,
+        )
+
+    def sort_by_score(self, descending: bool = True) -> "ProfileTable":
+
+        # Stable so that rows with equal scores keep their order either way.
+        inds = np.argsort(-self.score if descending else self.score, kind="stable")
+        return self.take(inds)
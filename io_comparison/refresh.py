@@ -0,0 +1,93 @@
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from io_comparison.decoding import dumps, loads
+
+
+# Bumped whenever the meaning of the stored keys or responses changes. Version 2 keys characters by realm slug and
+# field selection. A state file of any other version is discarded, so each character is fetched in full once rather
+# than looked up under keys that no longer match.
+STATE_VERSION = 2
+
+
+def parse_crawled_at(value: Optional[str]) -> Optional[datetime]:
+
+    # Raider IO timestamps are of the form "2021-03-02T09:52:03.000Z".
+    if value is None:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class RefreshState:
+    """
+    The last seen Raider IO response for each character, persisted as a JSON file between runs.
+
+    Raider IO only updates a character when it re-crawls them, which is recorded in ``last_crawled_at``. If that hasn't
+    advanced since the last run, the stored response is still current and the character doesn't need to be refetched.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+        self._characters: Dict[str, Dict[str, Any]] = {}
+        if self._path.exists():
+            with open(self._path, "rb") as f:
+                state = loads(f.read())
+            if state.get("version") == STATE_VERSION:
+                self._characters = state["characters"]
+
+    @property
+    def path(self) -> Path:
+        """
+        ``Path`` : the JSON file the state is stored in.
+        """
+        return self._path
+
+    def _make_key(self, key: Tuple[str, ...]) -> str:
+        return "|".join(key)
+
+    def get(self, key: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the last seen response for the character ``key`` (e.g., ``(region, realm, name)``), or ``None`` if it's
+        never been seen.
+        """
+        with self._lock:
+            return self._characters.get(self._make_key(key))
+
+    def is_current(self, key: Tuple[str, ...], last_crawled_at: Optional[str]) -> bool:
+        """
+        Whether the stored response for ``key`` is at least as recent as a crawl at ``last_crawled_at``.
+        """
+
+        io_results = self.get(key)
+        if io_results is None:
+            return False
+
+        stored = parse_crawled_at(io_results.get("last_crawled_at"))
+        latest = parse_crawled_at(last_crawled_at)
+        return stored is not None and latest is not None and stored >= latest
+
+    def update(self, key: Tuple[str, ...], io_results: Dict[str, Any]) -> bool:
+        """
+        Records ``io_results`` as the latest response for ``key``. Returns whether it differs from what was stored.
+        """
+
+        with self._lock:
+            previous = self._characters.get(self._make_key(key))
+            self._characters[self._make_key(key)] = io_results
+        return previous != io_results
+
+    def save(self) -> None:
+
+        # Written to a temporary file first so an interrupted run never leaves a truncated state behind.
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = self._path.with_name(f"{self._path.name}.partial")
+        with self._lock:
+            with open(partial_path, "w") as f:
+                f.write(dumps({"version": STATE_VERSION, "characters": self._characters}))
+        os.replace(partial_path, self._path)
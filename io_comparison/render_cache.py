@@ -0,0 +1,133 @@
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+DEFAULT_RENDER_CACHE_PATH = Path.home().joinpath(".cache/io_comparison/renders")
+
+
+def copy_atomically(source: Union[str, Path], destination: Union[str, Path]) -> None:
+    """
+    Atomically places a copy of ``source`` at ``destination``. Anything already at ``destination`` is replaced.
+
+    Always a copy rather than a hard link, so that editing a plot (e.g., annotating it by hand) can't also change the
+    render it was stored as or reused from.
+    """
+
+    destination = Path(destination)
+    partial = destination.with_name(f"{destination.name}.partial")
+    if partial.exists():
+        partial.unlink()
+
+    shutil.copyfile(source, partial)
+    os.replace(partial, destination)
+
+
+class RenderCache:
+    """
+    A content addressed store of rendered plots.
+
+    Each rendered file is stored under a key that hashes everything the render depends on (see
+    ``Plotter.get_render_key``), so an identical render can be reused rather than redrawn. Entries are files in
+    ``path`` whose modification time records when they were last used. Entries unused for more than ``max_age`` seconds
+    are evicted, as are the least recently used entries once they take up more than ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_age: Optional[float] = 7 * 24 * 3600.0,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+    ) -> None:
+        """
+        path : string or ``Path``, optional
+            The directory renders are stored in. It is created if it does not exist. Defaults to
+            ``DEFAULT_RENDER_CACHE_PATH``.
+
+        max_age : float, optional
+            Number of seconds an unused render is kept for. If ``None``, renders are never evicted by age.
+
+        max_bytes : int, optional
+            The maximum total size of the stored renders. If ``None``, renders are never evicted by size.
+        """
+
+        if path is None:
+            path = DEFAULT_RENDER_CACHE_PATH
+        self._path = Path(path)
+        self._path.mkdir(parents=True, exist_ok=True)
+
+        self._max_age = max_age
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        """
+        ``Path`` : the directory renders are stored in.
+        """
+        return self._path
+
+    def _entry_path(self, key: str, output_format: str) -> Path:
+        return self._path.joinpath(f"{key}.{output_format}")
+
+    def get(self, key: str, output_format: str) -> Optional[Path]:
+        """
+        Returns the stored render for ``key``, or ``None`` if there isn't one.
+        """
+
+        entry = self._entry_path(key, output_format)
+        try:
+            # Marks the entry as recently used.
+            os.utime(entry)
+        except FileNotFoundError:
+            return None
+        return entry
+
+    def set(self, key: str, output_format: str, rendered_file: Union[str, Path]) -> Path:
+        """
+        Stores ``rendered_file`` as the render for ``key`` and evicts stale entries. Returns the stored entry.
+        """
+
+        entry = self._entry_path(key, output_format)
+        with self._lock:
+            copy_atomically(rendered_file, entry)
+            os.utime(entry)
+            self._evict()
+        return entry
+
+    def _list_entries(self) -> List[Tuple[float, int, Path]]:
+
+        entries = []
+        for entry in self._path.iterdir():
+            if entry.name.endswith(".partial"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        return entries
+
+    def _evict(self) -> None:
+
+        # Most recently used first.
+        entries = sorted(self._list_entries(), key=lambda entry: entry[0], reverse=True)
+
+        now = time.time()
+        total_bytes = 0
+        for used_at, size, entry in entries:
+            total_bytes += size
+            too_old = self._max_age is not None and now - used_at > self._max_age
+            too_large = self._max_bytes is not None and total_bytes > self._max_bytes
+            if too_old or too_large:
+                entry.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, _, entry in self._list_entries():
+                entry.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._list_entries())
@@ -0,0 +1,199 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional, Tuple, Type
+
+
+class FetchError(Exception):
+    """Raised when a Raider IO request could not be completed, even after retrying."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, attempts: int = 1) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.attempts = attempts
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket rate limiter.
+
+    Tokens are replenished at ``rate`` per second up to ``capacity``; each request consumes one token and blocks until
+    one is available. The whole bucket can also be paused (e.g., when the server responds with a ``Retry-After``), so
+    that every worker backs off rather than just the one that was told to.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+
+        if rate <= 0:
+            raise ValueError(f"`rate` must be positive. Received {rate}.")
+
+        if capacity is None:
+            capacity = max(rate, 1.0)
+
+        self._rate = rate
+        self._capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._last_refill = clock()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+    def acquire(self) -> None:
+
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self._rate
+
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 5
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def backoff(self, attempt: int, rng: random.Random) -> float:
+        """
+        Exponential backoff with "full jitter", i.e., a uniformly random delay up to the exponential cap. This spreads
+        out retries from concurrent workers that failed at the same time.
+
+        References
+        ----------
+        https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+        """
+        return rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a ``Retry-After`` header, which is either a number of seconds or an HTTP date, into a number of seconds.
+    """
+
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class FetchScheduler:
+    """
+    Issues requests through a shared rate limiter, retrying rate limited and failed requests with backoff.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        transport_errors: Tuple[Type[BaseException], ...] = (),
+        sleep: Callable[[float], None] = time.sleep,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        rate_limiter : ``TokenBucket``, optional
+            Every attempt (including retries) consumes a token from this bucket. If not specified, requests are not
+            rate limited.
+
+        retry_policy : ``RetryPolicy``, optional
+            Controls which responses are retried and how long to wait between attempts.
+
+        transport_errors : tuple of exception types, optional
+            Exceptions raised by the client for connection failures and timeouts. These are retried like a 5xx.
+        """
+
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+        self._transport_errors = transport_errors
+        self._sleep = sleep
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._number_retries = 0
+
+    @property
+    def number_retries(self) -> int:
+        """
+        int : the total number of retries made by this scheduler.
+        """
+        return self._number_retries
+
+    def request(self, send: Callable[[], Any]) -> Any:
+        """
+        Calls ``send`` until it returns a response that shouldn't be retried, or the retries are exhausted. The final
+        response is returned (its status should still be checked); a ``FetchError`` is raised if the last attempt
+        failed with a transport error.
+        """
+
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+
+            retry_after = None
+            try:
+                response = send()
+            except self._transport_errors as err:
+                if attempt >= self._retry_policy.max_retries:
+                    raise FetchError(f"{type(err).__name__}: {err}", attempts=attempt + 1) from err
+            else:
+                if response.status_code not in self._retry_policy.retry_statuses:
+                    return response
+                if attempt >= self._retry_policy.max_retries:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            with self._lock:
+                delay = self._retry_policy.backoff(attempt, self._rng)
+                self._number_retries += 1
+
+            # The server knows better than our backoff. Pause everyone, not just this worker.
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+                if self._rate_limiter is not None:
+                    self._rate_limiter.pause(retry_after)
+
+            self._sleep(delay)
+            attempt += 1
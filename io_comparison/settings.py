@@ -31,5 +31,10 @@ CLASS_COLORS = {
     "warlock": "#8788EE",
     "warrior": "#C69B6D",
 }
+# Number of bosses in each raid we plot. Raids not listed here take the number of bosses from the profiles themselves.
+RAID_BOSSES = {
+    "castle-nathria": 10,
+    "sanctum-of-domination": 10,
+}
 CURRENT_RAID = "castle-nathria"
-CURRENT_RAID_BOSSES = 10
+CURRENT_RAID_BOSSES = RAID_BOSSES[CURRENT_RAID]
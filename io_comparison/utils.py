@@ -1,12 +1,13 @@
 from dataclasses import dataclass
-from typing import Any, Dict, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Tuple, Union
 
-from PIL import ImageColor
+import numpy as np
 
-from io_comparison.settings import CLASSES_SPECS
+from io_comparison.settings import CLASS_COLORS, CLASSES_SPECS
 
 
-@dataclass
+@dataclass(frozen=True)
 class ClassSpecIndex:
     class_idx: int
     num_classes: int
@@ -28,50 +29,108 @@ def determine_number_players(data: Dict[str, Any]) -> int:
             count += 1
     return count
 
-def build_class_spec_inds() -> Dict[str, Dict[str, ClassSpecIndex]]:
+def _build_class_spec_table() -> Mapping[str, Mapping[str, ClassSpecIndex]]:
+
+    num_classes = len(CLASSES_SPECS)
+    num_global = sum(len(specs) for specs in CLASSES_SPECS.values())
+
+    # The global index counts across the flattened (class, spec) combinations. Keying on the pair (rather than just the
+    # spec) avoids issues where a single spec can refer to multiple classes (e.g. "Holy" could be Paladin or Priest).
+    table = {}
+    global_idx = 0
+    for class_idx, (class_, specs) in enumerate(CLASSES_SPECS.items()):
+        class_table = {}
+        for spec_idx, spec in enumerate(specs):
+            class_table[spec] = ClassSpecIndex(class_idx, num_classes, spec_idx, len(specs), global_idx, num_global)
+            global_idx += 1
+        table[class_] = MappingProxyType(class_table)
+
+    return MappingProxyType(table)
+
+
+# Built once at import. ``CLASSES_SPECS`` is fixed so this never needs to be rebuilt.
+CLASS_SPEC_TABLE = _build_class_spec_table()
+
+# The (class, spec) pair for each global index.
+CLASS_SPEC_PAIRS: Tuple[Tuple[str, str], ...] = tuple(
+    (class_, spec) for class_, specs in CLASSES_SPECS.items() for spec in specs
+)
+
+# Sorted ``"class/spec"`` keys alongside their global index, allowing arrays of pairs to be looked up with a single
+# ``np.searchsorted``.
+_CLASS_SPEC_KEYS, _CLASS_SPEC_GLOBAL_INDS = (
+    np.array(values)
+    for values in zip(
+        *sorted(
+            (f"{class_}/{spec}", inds_info.global_idx)
+            for class_, class_table in CLASS_SPEC_TABLE.items()
+            for spec, inds_info in class_table.items()
+        )
+    )
+)
 
-    inds_info = {
-        class_: {
-            spec: get_class_spec_inds(class_, spec) for spec in specs
-        }
-        for class_, specs in CLASSES_SPECS.items()
-    }
-    return inds_info
+
+def build_class_spec_inds() -> Mapping[str, Mapping[str, ClassSpecIndex]]:
+    return CLASS_SPEC_TABLE
 
 
 def get_class_spec_inds(class_: str, spec: str) -> ClassSpecIndex:
+    return CLASS_SPEC_TABLE[class_][spec]
 
-    class_idx = list(CLASSES_SPECS.keys()).index(class_)
-    num_classes = len(CLASSES_SPECS)
 
-    spec_idx = CLASSES_SPECS[class_].index(spec)
-    num_specs = len(CLASSES_SPECS[class_])
+def get_global_inds(
+    classes: Union[np.ndarray, Iterable[str]], specs: Union[np.ndarray, Iterable[str]]
+) -> np.ndarray:
+    """
+    Returns the global index of every ``(classes[i], specs[i])`` pair.
+    """
 
-    # When flattening out the specs, need to build a list of unique (class, spec) combinations. Otherwise we will run
-    # into issues where a single spec can refer to multiple classes (e.g. "Holy" could be Paladin or Priest).
-    flattened = []
-    for this_class, specs in CLASSES_SPECS.items():
-        class_specs = [(this_class, spec) for spec in specs]
-        flattened.extend(class_specs)
+    keys = np.char.add(np.char.add(np.asarray(classes, dtype=str), "/"), np.asarray(specs, dtype=str))
+    if keys.size == 0:
+        return np.zeros(keys.shape, dtype=int)
 
-    global_idx = flattened.index((class_, spec))
-    num_global = len(flattened)
+    positions = np.searchsorted(_CLASS_SPEC_KEYS, keys).clip(max=len(_CLASS_SPEC_KEYS) - 1)
+    unknown = _CLASS_SPEC_KEYS[positions] != keys
+    if unknown.any():
+        raise KeyError(f"Unknown (class, spec) combinations: {sorted(set(keys[unknown]))}")
 
-    return ClassSpecIndex(class_idx, num_classes, spec_idx, num_specs, global_idx, num_global)
+    return _CLASS_SPEC_GLOBAL_INDS[positions]
 
 
-def get_text_color(background_color: str) -> str:
+def get_global_x_positions(
+    classes: Union[np.ndarray, Iterable[str]], specs: Union[np.ndarray, Iterable[str]]
+) -> np.ndarray:
     """
-    Input and output are hex-codes.
+    Returns the relative x-position (in ``[0, 1)``) of every ``(classes[i], specs[i])`` pair.
+    """
+    return get_global_inds(classes, specs) / len(_CLASS_SPEC_KEYS)
+
+
+def hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    """
+    Converts a hex-code (``"#RRGGBB"`` or the shorthand ``"#RGB"``) to its ``(red, green, blue)`` components.
+    """
+
+    digits = color.lstrip("#")
+    if len(digits) == 3:
+        digits = "".join(digit * 2 for digit in digits)
+    if len(digits) != 6:
+        raise ValueError(f"{color} is not a hex-code.")
+
+    return (int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16))
+
+
+def get_text_color(background_color: str) -> Tuple[str, str]:
+    """
+    Returns the ``(text, outline)`` colors that stand out against ``background_color``. Input and output are
+    hex-codes.
 
     References
     ----------
     https://stackoverflow.com/questions/1855884/determine-font-color-based-on-background-color
-
-    FIXME: Update docstring and comments.
     """
 
-    rgb_background = ImageColor.getcolor(background_color, "RGB")
+    rgb_background = hex_to_rgb(background_color)
 
     # Calculate the perceptive luminance.
     luma = ((0.299 * rgb_background[0]) + (0.587 * rgb_background[1]) + (0.114 * rgb_background[2])) / 255
@@ -81,3 +140,24 @@ def get_text_color(background_color: str) -> str:
         return ("#000000", "#FFFFFF")
     else:
         return ("#FFFFFF", "#000000")
+
+
+@dataclass(frozen=True)
+class ClassStyle:
+    color: str
+
+    # Colors of the text drawn over the class color, and of its outline.
+    text_color: str
+    outline_color: str
+
+
+def _build_class_style_table() -> Mapping[str, ClassStyle]:
+
+    table = {}
+    for class_, color in CLASS_COLORS.items():
+        table[class_] = ClassStyle(color, *get_text_color(color))
+    return MappingProxyType(table)
+
+
+# Built once at import, like ``CLASS_SPEC_TABLE``. ``CLASS_COLORS`` is fixed so this never needs to be rebuilt.
+CLASS_STYLE_TABLE = _build_class_style_table()
@@ -0,0 +1,11 @@
+import pytest
+
+from stub_io_server import StubIOServer
+
+
+@pytest.fixture
+def stub_io_server():
+    server = StubIOServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,112 @@
+"""
+Sample rosters, Raider IO responses and profiles shared between the tests and benchmarks.
+"""
+from typing import Any, Dict, List
+
+from io_comparison.player_profile import Difficulty, Profile, Progression
+
+
+def get_data() -> Dict[str, Any]:
+
+    data = {
+        "priest": {
+            "discipline": {
+                "player_handle": "Porige",
+                "character_realm": "frostmourne",
+                "character_name": "porige",
+                "region": "US",
+                "guild": "Superstars",
+            },
+            "holy": {
+                "player_handle": "Vegan",
+                "character_realm": "barthilas",
+                "character_name": "veganheals",
+                "region": "US",
+                "guild": "Abyssal",
+            },
+            "shadow": {
+                "player_handle": "Erod",
+                "character_realm": "frostmourne",
+                "character_name": "erod",
+                "region": "US",
+                "guild": "None",
+            },
+        }
+    }
+    return data
+
+
+def mock_io_data() -> Dict[str, Any]:
+    """
+    Returns data in the same format that will be received from Raider IO.
+    """
+
+    data = {
+        "name": "Veganheals",
+        "race": "Goblin",
+        "class": "Priest",
+        "active_spec_name": "Holy",
+        "active_spec_role": "HEALING",
+        "gender": "male",
+        "faction": "horde",
+        "achievement_points": 14795,
+        "honorable_kills": 0,
+        "thumbnail_url": "https://render-us.worldofwarcraft.com/character/barthilas/218/199505114-avatar.jpg?alt=wow/static/images/2d/avatar/9-0.jpg",
+        "region": "us",
+        "realm": "Barthilas",
+        "last_crawled_at": "2021-03-02T09:52:03.000Z",
+        "profile_url": "https://raider.io/characters/us/barthilas/Veganheals",
+        "profile_banner": "hordebanner1",
+        "mythic_plus_scores": {"all": 925.6, "dps": 0, "healer": 925.6, "tank": 0, "spec_0": 0, "spec_1": 925.6, "spec_2": 0, "spec_3": 0},
+        "raid_progression": {
+            "castle-nathria": {
+                "summary": "2/10 M",
+                "total_bosses": 10,
+                "normal_bosses_killed": 8,
+                "heroic_bosses_killed": 10,
+                "mythic_bosses_killed": 2
+            }
+        }
+    }
+    return data
+
+
+def get_profiles() -> List[Profile]:
+
+    return [
+        Profile(
+            class_="priest",
+            spec="holy",
+            player_handle="Vegan",
+            character_name="veganheals",
+            character_realm="barthilas",
+            region="US",
+            score=925.6,
+            guild="Abyssal",
+            progression={"castle-nathria": Progression(2, 10, Difficulty.M)},
+        ),
+        Profile(
+            class_="paladin",
+            spec="holy",
+            player_handle="Porige",
+            character_name="porige",
+            character_realm="frostmourne",
+            region="US",
+            score=2500.0,
+            guild="Superstars",
+            progression={"castle-nathria": Progression(10, 10, Difficulty.M)},
+            notes="Also plays priest.",
+            special=True,
+        ),
+        Profile(
+            class_="priest",
+            spec="shadow",
+            player_handle="Erod",
+            character_name="erod",
+            character_realm="frostmourne",
+            region="US",
+            score=1800.0,
+            guild="None",
+            progression={},
+        ),
+    ]
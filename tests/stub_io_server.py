@@ -0,0 +1,118 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+
+class StubIOServer:
+    """
+    A local stand-in for the Raider IO character profile endpoint.
+
+    Every request is recorded in ``requests`` (as the parsed query parameters). The response for a character is taken
+    from ``payloads`` (keyed by the lower-case character name), falling back to ``default_payload`` with the requested
+    name/realm/region substituted in.
+
+    Error responses can be scripted per character through ``scripted``, a queue of ``(status, headers, body)`` that is
+    consumed one request at a time before falling back to the payload. Otherwise, a fraction ``error_rate`` of requests
+    are answered at random with a retryable 503.
+
+    Every response is held back by ``latency`` seconds, or by the character's own delay in ``latencies`` (keyed by the
+    lower-case character name), so that responses can complete out of order.
+
+    Bodies are sent as JSON, except for ``bytes``, which are sent as they are (e.g., to answer with a truncated body).
+    """
+
+    def __init__(
+        self,
+        default_payload: Optional[Dict[str, Any]] = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+
+        self.default_payload = default_payload
+        self.payloads: Dict[str, Union[Dict[str, Any], bytes]] = {}
+        self.scripted: Dict[str, List[Tuple[int, Dict[str, str], Union[Dict[str, Any], bytes]]]] = {}
+        self.latency = latency
+        self.latencies: Dict[str, float] = {}
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self.requests: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            # Keeps connections alive between requests, as Raider IO does. The headers and body are written
+            # separately, so Nagle's algorithm would otherwise hold back every response on a kept-alive connection.
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                stub._handle(self)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        class _Server(ThreadingHTTPServer):
+            # The default backlog of 5 drops connections (and stalls clients for a second) once a handful of workers
+            # connect at once.
+            request_queue_size = 128
+
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/v1/characters/profile?"
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _build_payload(self, query: Dict[str, str]) -> Union[Dict[str, Any], bytes]:
+
+        name = query.get("name", "").lower()
+        if name in self.payloads:
+            return self.payloads[name]
+
+        payload = dict(self.default_payload or {})
+        payload["name"] = query.get("name", "").title()
+        payload["realm"] = query.get("realm", "").title()
+        payload["region"] = query.get("region", "").lower()
+        return payload
+
+    def _handle(self, request: BaseHTTPRequestHandler) -> None:
+
+        query = {key: values[0] for key, values in parse_qs(urlparse(request.path).query).items()}
+        with self._lock:
+            self.requests.append(query)
+
+        latency = self.latencies.get(query.get("name", "").lower(), self.latency)
+        if latency:
+            time.sleep(latency)
+
+        with self._lock:
+            scripted = self.scripted.get(query.get("name", "").lower())
+            if scripted:
+                status, headers, payload = scripted.pop(0)
+            elif self.error_rate and self._rng.random() < self.error_rate:
+                status, headers, payload = 503, {}, {"message": "Service Unavailable"}
+            else:
+                status, headers, payload = 200, {}, self._build_payload(query)
+
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        request.send_response(status)
+        for key, value in headers.items():
+            request.send_header(key, value)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
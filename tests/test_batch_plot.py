@@ -0,0 +1,73 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+from sample_data import get_data, mock_io_data
+
+_REPO_DIR = Path(__file__).parents[1]
+
+
+def _run_batch(arguments: List[str], cwd: Path) -> subprocess.CompletedProcess:
+
+    # Run as a script, as it's used, with plots written under ``cwd``.
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(_REPO_DIR), env.get("PYTHONPATH", "")])
+    return subprocess.run(
+        [sys.executable, str(_REPO_DIR.joinpath("commands/batch_plot.py")), *arguments],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_batch_plot(stub_io_server, tmp_path) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
+
+    # Two rosters sharing a character, which is fetched once and then served from the shared cache.
+    first = get_data()
+    second = {"priest": {"holy": get_data()["priest"]["holy"]}}
+    roster_fnames = []
+    for name, roster in [("first", first), ("second", second)]:
+        roster_fname = tmp_path.joinpath(f"{name}.json")
+        roster_fname.write_text(json.dumps(roster))
+        roster_fnames.append(str(roster_fname))
+
+    common = ["--base-url", stub_io_server.base_url, "--cache", str(tmp_path.joinpath("responses.sqlite"))]
+    arguments = [*roster_fnames, "--workers", "1", "--no-render-cache", "--no-reuse-figures", *common]
+    result = _run_batch(arguments, tmp_path)
+    assert result.returncode == 0, result.stderr
+
+    assert tmp_path.joinpath("plots/first.png").exists()
+    assert tmp_path.joinpath("plots/second.png").exists()
+    assert sorted(request["name"] for request in stub_io_server.requests) == ["erod", "porige", "veganheals"]
+
+    # Rosters whose plots would overwrite each other are rejected before anything is fetched.
+    tmp_path.joinpath("other").mkdir()
+    duplicate_fname = tmp_path.joinpath("other/first.json")
+    duplicate_fname.write_text(json.dumps(second))
+    result = _run_batch([roster_fnames[0], str(duplicate_fname), *common], tmp_path)
+    assert result.returncode != 0
+    assert "first" in result.stderr
+
+
+def test_batch_plot_failed_roster(stub_io_server, tmp_path) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
+    good_fname = tmp_path.joinpath("good.json")
+    good_fname.write_text(json.dumps(get_data()))
+    bad_fname = tmp_path.joinpath("bad.json")
+    bad_fname.write_text(json.dumps({"priest": 3}))
+
+    arguments = [str(good_fname), str(bad_fname), "--workers", "1", "--no-render-cache"]
+    arguments += ["--base-url", stub_io_server.base_url, "--cache", str(tmp_path.joinpath("responses.sqlite"))]
+    result = _run_batch(arguments, tmp_path)
+
+    # The other rosters are still plotted and reported, but the batch as a whole fails.
+    assert result.returncode == 1, result.stderr
+    assert tmp_path.joinpath("plots/good.png").exists()
+    assert "Rendered 1 of 2 rosters" in result.stdout
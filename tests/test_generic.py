@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from io_comparison.generic import FloatRangeDict
+
+
+def get_class() -> FloatRangeDict:
+    return FloatRangeDict({(0.5, 0.7): "bronze", (0, 0.5): "black", (0.9, 1.01): "gold", (0.7, 0.9): "silver"})
+
+
+def test_lookup() -> None:
+
+    ranges = get_class()
+
+    assert ranges[0] == "black"
+    assert ranges[0.5] == "bronze"
+    assert ranges[0.89] == "silver"
+    assert ranges[1.0] == "gold"
+    assert ranges[(0.7, 0.9)] == "silver"
+
+    for item in [-0.1, 1.01, 2]:
+        with pytest.raises(KeyError):
+            ranges[item]
+
+
+def test_lookup_many() -> None:
+
+    ranges = get_class()
+
+    values = ranges.lookup_many(np.array([0.0, 0.2, 0.5, 0.8, 1.0]))
+    assert values.tolist() == ["black", "black", "bronze", "silver", "gold"]
+
+    with pytest.raises(KeyError):
+        ranges.lookup_many(np.array([0.2, 1.5]))
+
+
+def test_overlapping_ranges() -> None:
+
+    with pytest.raises(ValueError):
+        FloatRangeDict({(0, 0.6): "black", (0.5, 0.7): "bronze"})
+
+    ranges = get_class()
+    with pytest.raises(ValueError):
+        ranges[(0.8, 0.95)] = "platinum"
+
+    # A rejected range leaves the existing ranges intact.
+    assert (0.8, 0.95) not in ranges
+    assert ranges[0.85] == "silver"
+
+    # Removing and re-adding ranges keeps lookups consistent.
+    del ranges[(0.7, 0.9)]
+    with pytest.raises(KeyError):
+        ranges[0.8]
+    ranges[(0.7, 0.9)] = "grey"
+    assert ranges[0.8] == "grey"
@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+# Wall clock budget (in seconds) for importing the fetch side of the package in a fresh interpreter. Loose enough for a
+# slow CI machine, but far below the cost of pulling in matplotlib, numpy or requests by accident.
+_IMPORT_BUDGET = 0.5
+
+_HEAVY_MODULES = ["matplotlib", "numpy", "PIL", "requests", "rich", "tqdm"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+duration = time.perf_counter() - start
+backend = None
+if "matplotlib.pyplot" in sys.modules:
+    import matplotlib
+    backend = matplotlib.get_backend()
+print(json.dumps({{"duration": duration, "modules": sorted(sys.modules), "backend": backend}}))
+"""
+
+
+def _import_in_subprocess(module: str) -> Dict[str, Any]:
+
+    # A fresh interpreter, as modules already imported by the test session would otherwise hide the cost.
+    env = dict(os.environ)
+    env.pop("MPLBACKEND", None)
+    env["PYTHONPATH"] = os.pathsep.join([str(Path(__file__).parents[1]), env.get("PYTHONPATH", "")])
+
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)], env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "io_comparison.player_profile",
+        "io_comparison.decoding",
+        "io_comparison.fields",
+        "io_comparison.cache",
+        "io_comparison.refresh",
+        "io_comparison.instrumentation",
+    ],
+)
+def test_import_is_light(module: str) -> None:
+
+    result = _import_in_subprocess(module)
+    imported = set(result["modules"])
+    for heavy_module in _HEAVY_MODULES:
+        assert heavy_module not in imported, f"Importing {module} imports {heavy_module}"
+
+    assert result["duration"] < _IMPORT_BUDGET
+
+
+def test_plot_uses_agg_backend() -> None:
+
+    result = _import_in_subprocess("io_comparison.plot")
+    assert result["backend"].lower() == "agg"
+
+    # Fetching and progress reporting are not needed to plot.
+    imported = set(result["modules"])
+    for module in ["requests", "rich", "tqdm"]:
+        assert module not in imported
@@ -1,71 +1,23 @@
-from typing import Dict, Any, List
+import copy
+import json
+import pickle
+import time
+from typing import Dict, Any, List, Optional
 
-from io_comparison.player_profile import ProfileHandler, Profile
-from io_comparison.plot import Plotter
+import pytest
 
+from io_comparison.cache import ResponseCache
+from io_comparison.client import RaiderIOClient
+from io_comparison.decoding import DecodeError, decode_response, load_roster, validate_response, validate_roster
+from io_comparison.fields import FieldSelection
+from io_comparison.instrumentation import HISTOGRAM_BUCKETS, NULL_INSTRUMENTATION, Instrumentation
+from io_comparison.player_profile import MAX_REPORTED_INVALID_LINES, Difficulty, ProfileHandler, Profile, Progression
+from io_comparison.scheduler import RetryPolicy, TokenBucket, parse_retry_after
+from io_comparison.plot import Plotter
+from io_comparison.plot_helper import generate_plot_helper
+from io_comparison.refresh import STATE_VERSION, RefreshState
+from sample_data import get_data, mock_io_data
 
-def get_data() -> Dict[str, Any]:
-
-    data = {
-        "priest": {
-            "discipline": {
-                "player_handle": "Porige",
-                "character_realm": "frostmourne",
-                "character_name": "porige",
-                "region": "US",
-                "guild": "Superstars",
-            },
-            "holy": {
-                "player_handle": "Vegan",
-                "character_realm": "barthilas",
-                "character_name": "veganheals",
-                "region": "US",
-                "guild": "Abyssal",
-            },
-            "shadow": {
-                "player_handle": "Erod",
-                "character_realm": "frostmourne",
-                "character_name": "erod",
-                "region": "US",
-                "guild": "None",
-            },
-        }
-    }
-    return data
-
-def mock_io_data() -> Dict[str, Any]:
-    """
-    Returns data in the same format that will be received from Raider IO.
-    """
-
-    data = {
-        "name": "Veganheals",
-        "race": "Goblin",
-        "class": "Priest",
-        "active_spec_name": "Holy",
-        "active_spec_role": "HEALING",
-        "gender": "male",
-        "faction": "horde",
-        "achievement_points": 14795,
-        "honorable_kills": 0,
-        "thumbnail_url": "https://render-us.worldofwarcraft.com/character/barthilas/218/199505114-avatar.jpg?alt=wow/static/images/2d/avatar/9-0.jpg",
-        "region": "us",
-        "realm": "Barthilas",
-        "last_crawled_at": "2021-03-02T09:52:03.000Z",
-        "profile_url": "https://raider.io/characters/us/barthilas/Veganheals",
-        "profile_banner": "hordebanner1",
-        "mythic_plus_scores": {"all": 925.6, "dps": 0, "healer": 925.6, "tank": 0, "spec_0": 0, "spec_1": 925.6, "spec_2": 0, "spec_3": 0},
-        "raid_progression": {
-            "castle-nathria": {
-                "summary": "2/10 M",
-                "total_bosses": 10,
-                "normal_bosses_killed": 8,
-                "heroic_bosses_killed": 10,
-                "mythic_bosses_killed": 2
-            }
-        }
-    }
-    return data
 
 # TODO: Put this into a class for testing the methods inside ProfileHandler
 def test_io_formatting() -> None:
@@ -95,8 +47,419 @@ def test_plotting_profiles() -> None:
     plotter.plot_profiles(profiles, "test")
 
 
-def test_generation() -> None:
+def test_generation(stub_io_server) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
+
+    x = ProfileHandler(base_url=stub_io_server.base_url)
+    data = get_data()
+    profiles = x.generate_player_profiles(data=data)
+
+    assert len(profiles) == 3
+    assert x.summary.number_failed == 0
+
+
+def test_concurrent_generation_keeps_roster_order(stub_io_server) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
+    # Responses complete in the reverse of roster order (erod, veganheals, porige), so neither completion order nor
+    # sequential fetching would pass.
+    stub_io_server.latencies = {"porige": 0.6, "veganheals": 0.35, "erod": 0.1}
+
+    data = get_data()
+    handler = ProfileHandler(max_workers=3, base_url=stub_io_server.base_url, rate_limit=None)
+    start = time.perf_counter()
+    profiles = handler.generate_player_profiles(data=data)
+    duration = time.perf_counter() - start
+
+    # Fetched concurrently, the roster takes about as long as its slowest character rather than the sum of all three.
+    assert duration < 0.9
+    assert [profile.spec for profile in profiles] == ["discipline", "holy", "shadow"]
+    assert [profile.character_name for profile in profiles] == ["porige", "veganheals", "erod"]
+    assert len(stub_io_server.requests) == 3
+
+
+def test_cached_generation(stub_io_server, tmp_path) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
+    data = get_data()
+
+    cache = ResponseCache(tmp_path.joinpath("responses.sqlite"), ttl=60.0)
+    handler = ProfileHandler(base_url=stub_io_server.base_url, cache=cache)
+    handler.generate_player_profiles(data=data)
+    assert len(stub_io_server.requests) == 3
+
+    # Second pass should be served entirely from the cache, as should an offline pass.
+    handler.generate_player_profiles(data=data)
+    offline_profiles = ProfileHandler(cache=cache, offline=True).generate_player_profiles(data=data)
+    assert len(stub_io_server.requests) == 3
+    assert [profile.score for profile in offline_profiles] == [925.6, 925.6, 925.6]
+
+
+def test_cache_eviction(tmp_path) -> None:
+
+    cache = ResponseCache(tmp_path.joinpath("responses.sqlite"), ttl=None, max_entries=2)
+    fields = "raid_progression,mythic_plus_scores"
+
+    cache.set("us", "barthilas", "a", fields, {"name": "a"})
+    cache.set("us", "barthilas", "b", fields, {"name": "b"})
+    cache.get("us", "barthilas", "a", fields)  # Touch ``a`` so that ``b`` becomes the least recently used.
+    cache.set("us", "barthilas", "c", fields, {"name": "c"})
+
+    assert len(cache) == 2
+    assert cache.get("us", "barthilas", "b", fields) is None
+    assert cache.get("US", "Barthilas", "A", fields) == {"name": "a"}
+
+
+def test_offline_cache_miss(tmp_path) -> None:
+
+    cache = ResponseCache(tmp_path.joinpath("responses.sqlite"))
+    handler = ProfileHandler(cache=cache, offline=True)
+
+    profiles = handler.generate_player_profiles(data=get_data())
+    assert profiles == []
+    assert handler.summary.number_failed == 3
+
+
+def test_duplicate_characters_are_fetched_once(stub_io_server) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
 
-    x = ProfileHandler()
     data = get_data()
-    x.generate_player_profiles(data=data)
+    data["priest"]["shadow"] = dict(data["priest"]["holy"], character_name="VeganHeals")
+
+    handler = ProfileHandler(base_url=stub_io_server.base_url)
+    profiles = handler.generate_player_profiles(data=data)
+
+    assert [profile.spec for profile in profiles] == ["discipline", "holy", "shadow"]
+    assert len(stub_io_server.requests) == 2
+    assert handler.summary.number_characters == 3
+    assert handler.summary.number_collapsed == 1
+
+
+def test_shared_client_is_reused(stub_io_server) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
+
+    with RaiderIOClient(pool_size=2) as client:
+        for _ in range(2):
+            with ProfileHandler(max_workers=2, base_url=stub_io_server.base_url, client=client) as handler:
+                profiles = handler.generate_player_profiles(data=get_data())
+            assert len(profiles) == 3
+
+    assert len(stub_io_server.requests) == 6
+
+
+def test_retries_and_failure_isolation(stub_io_server) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
+    stub_io_server.scripted["porige"] = [(429, {"Retry-After": "0"}, {}), (503, {}, {})]
+    stub_io_server.scripted["erod"] = [
+        (400, {}, {"statusCode": 400, "error": "Bad Request", "message": "Could not find requested character"})
+    ]
+
+    retry_policy = RetryPolicy(max_retries=3, backoff_base=0.01)
+    handler = ProfileHandler(base_url=stub_io_server.base_url, rate_limit=None, retry_policy=retry_policy)
+    profiles = handler.generate_player_profiles(data=get_data())
+
+    # Porige succeeds on the third attempt; Erod can't be found and is reported rather than crashing the roster.
+    assert [profile.character_name for profile in profiles] == ["porige", "veganheals"]
+    assert handler.summary.number_retries == 2
+    assert handler.summary.number_failed == 1
+    assert handler.summary.failures[0].character_name == "erod"
+    assert handler.summary.failures[0].status_code == 400
+    assert "Could not find requested character" in handler.summary.failures[0].reason
+
+
+def test_token_bucket() -> None:
+
+    now = [0.0]
+
+    def sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2.0, capacity=2.0, clock=lambda: now[0], sleep=sleep)
+    for _ in range(6):
+        bucket.acquire()
+
+    # Two requests are served from the initial burst, the remaining four at 2 per second.
+    assert now[0] == pytest.approx(2.0)
+
+    bucket.pause(5.0)
+    bucket.acquire()
+    assert now[0] == pytest.approx(7.0)
+
+
+def test_parse_retry_after() -> None:
+
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+def test_streaming_generation(stub_io_server, tmp_path) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
+    handler = ProfileHandler(base_url=stub_io_server.base_url, rate_limit=None)
+
+    plotter = Plotter(plot_helper=generate_plot_helper(output_path=f"{tmp_path}/"))
+    snapshots: List[int] = []
+    plot_profiles = plotter.plot_profiles
+    plotter.plot_profiles = lambda profiles, *args: snapshots.append(len(profiles)) or plot_profiles(profiles, *args)
+
+    profiles = plotter.plot_profiles_incrementally(
+        handler.iter_player_profiles(data=get_data()), "stream", snapshot_every=2
+    )
+
+    assert sorted(profile.spec for profile in profiles) == ["discipline", "holy", "shadow"]
+    assert snapshots == [2, 3]
+    assert tmp_path.joinpath("stream.png").exists()
+    assert not tmp_path.joinpath("stream.png.partial").exists()
+
+
+def test_incremental_refresh(stub_io_server, tmp_path) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
+    state_path = tmp_path.joinpath("state.json")
+
+    def generate(field_selection: Optional[FieldSelection] = None) -> ProfileHandler:
+        handler = ProfileHandler(
+            base_url=stub_io_server.base_url,
+            rate_limit=None,
+            refresh_state=RefreshState(state_path),
+            field_selection=field_selection,
+        )
+        handler.generate_player_profiles(data=get_data())
+        return handler
+
+    handler = generate()
+    assert handler.summary.number_changed == 3
+    assert state_path.exists()
+    assert json.loads(state_path.read_text())["version"] == STATE_VERSION
+
+    # Nothing has been re-crawled, so each character is only probed (without ``fields``).
+    stub_io_server.requests.clear()
+    handler = generate()
+    assert handler.summary.number_changed == 0
+    assert handler.summary.number_unchanged == 3
+    assert all("fields" not in request for request in stub_io_server.requests)
+
+    # Erod is re-crawled and is the only character refetched in full.
+    stub_io_server.requests.clear()
+    stub_io_server.payloads["erod"] = dict(mock_io_data(), name="Erod", last_crawled_at="2021-03-03T09:52:03.000Z")
+    handler = generate()
+    assert handler.summary.number_changed == 1
+    assert [request["name"] for request in stub_io_server.requests if "fields" in request] == ["erod"]
+
+    # Responses stored for one field selection aren't reused for another, which would be missing fields.
+    stub_io_server.requests.clear()
+    handler = generate(FieldSelection(attributes=("score",)))
+    assert handler.summary.number_unchanged == 0
+    assert all(request.get("fields") == "mythic_plus_scores" for request in stub_io_server.requests)
+    handler = generate(FieldSelection(attributes=("score",)))
+    assert handler.summary.number_unchanged == 3
+
+    # State written by older versions (with differently formed keys) is discarded rather than reused.
+    state_path.write_text(json.dumps({"eu|frostmourne|erod": mock_io_data()}))
+    handler = generate()
+    assert handler.summary.number_unchanged == 0
+
+
+def test_profiles_are_lean() -> None:
+
+    handler = ProfileHandler()
+    first = handler._format_io_results(mock_io_data(), "priest", "holy", get_data()["priest"]["holy"])
+    second = handler._format_io_results(
+        mock_io_data(), "priest", "holy", {key: "".join(value) for key, value in get_data()["priest"]["holy"].items()}
+    )
+
+    assert not hasattr(first, "__dict__")
+    with pytest.raises(AttributeError):
+        first.score = 0
+
+    # Shared strings and identical progression are stored once.
+    assert first.character_realm is second.character_realm
+    assert first.progression is second.progression
+
+    # Profiles can still be sent to other processes and copied.
+    assert pickle.loads(pickle.dumps(first)) == first
+    assert copy.deepcopy(first) == first
+    with pytest.raises(TypeError):
+        first.progression["castle-nathria"] = Progression(0, 10, Difficulty.M)
+
+
+def test_multi_raid_progression() -> None:
+
+    io_data = mock_io_data()
+    io_data["raid_progression"]["sanctum-of-domination"] = {
+        "summary": "7/10 H",
+        "total_bosses": 10,
+        "normal_bosses_killed": 10,
+        "heroic_bosses_killed": 7,
+        "mythic_bosses_killed": 0,
+    }
+
+    # Older raids may only have a summary.
+    io_data["raid_progression"]["nyalotha-the-waking-city"] = {"summary": "12/12 M"}
+
+    handler = ProfileHandler()
+    profile = handler._format_io_results(io_data, "priest", "holy", get_data()["priest"]["holy"])
+
+    assert profile.progression["castle-nathria"] == Progression(2, 10, Difficulty.M)
+    assert profile.progression["sanctum-of-domination"] == Progression(7, 10, Difficulty.H)
+    assert profile.progression["nyalotha-the-waking-city"] == Progression(12, 12, Difficulty.M)
+
+
+def test_field_projection(stub_io_server, tmp_path) -> None:
+
+    io_data = mock_io_data()
+    io_data["raid_progression"]["sanctum-of-domination"] = {"summary": "7/10 H"}
+    stub_io_server.default_payload = io_data
+
+    cache = ResponseCache(tmp_path.joinpath("responses.sqlite"), ttl=60.0)
+    selection = FieldSelection(raids=("castle-nathria",))
+    handler = ProfileHandler(base_url=stub_io_server.base_url, cache=cache, field_selection=selection)
+    profiles = handler.generate_player_profiles(data=get_data())
+
+    assert [profile.score for profile in profiles] == [925.6, 925.6, 925.6]
+    assert list(profiles[0].progression) == ["castle-nathria"]
+    assert stub_io_server.requests[0]["fields"] == "mythic_plus_scores,raid_progression"
+
+    # Only the keys that are used are cached.
+    cached = cache.get("US", "barthilas", "veganheals", selection.cache_key)
+    assert set(cached) == {"last_crawled_at", "mythic_plus_scores", "raid_progression"}
+    assert cached["mythic_plus_scores"] == {"all": 925.6}
+    assert list(cached["raid_progression"]) == ["castle-nathria"]
+
+    # Score only.
+    stub_io_server.requests.clear()
+    handler = ProfileHandler(base_url=stub_io_server.base_url, field_selection=FieldSelection(attributes=("score",)))
+    profiles = handler.generate_player_profiles(data=get_data())
+    assert stub_io_server.requests[0]["fields"] == "mythic_plus_scores"
+    assert all(profile.progression == {} for profile in profiles)
+
+    with pytest.raises(ValueError):
+        FieldSelection(attributes=("guild",))
+
+
+def test_decoding(tmp_path) -> None:
+
+    roster_path = tmp_path.joinpath("roster.json")
+    roster_path.write_text(json.dumps(get_data()))
+    assert load_roster(roster_path) == get_data()
+    assert decode_response(json.dumps(mock_io_data()).encode()) == mock_io_data()
+
+    # Schema problems are reported with where they are.
+    invalid = get_data()
+    del invalid["priest"]["holy"]["region"]
+    with pytest.raises(DecodeError, match="priest/holy is missing `region`"):
+        validate_roster(invalid)
+
+    with pytest.raises(DecodeError):
+        decode_response(b'{"mythic_plus_scores": {"all": "high"}}')
+    with pytest.raises(DecodeError):
+        decode_response(b"not json")
+
+    # Progression must be readable from either the summary or the kill counts.
+    for raid_results in [{"summary": "lots/10 M"}, {"total_bosses": 10}, {"mythic_bosses_killed": 2}]:
+        with pytest.raises(DecodeError):
+            validate_response({"raid_progression": {"castle-nathria": raid_results}})
+
+
+def test_malformed_response_is_a_failure(stub_io_server) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
+    stub_io_server.payloads["erod"] = dict(mock_io_data(), raid_progression={"castle-nathria": {"total_bosses": "ten"}})
+
+    handler = ProfileHandler(base_url=stub_io_server.base_url, rate_limit=None)
+    profiles = handler.generate_player_profiles(data=get_data())
+
+    assert [profile.character_name for profile in profiles] == ["porige", "veganheals"]
+    assert handler.summary.failures[0].character_name == "erod"
+
+    # Responses that are valid, but missing what a profile needs, are also isolated to their character.
+    stub_io_server.payloads["erod"] = dict(mock_io_data(), mythic_plus_scores={})
+    profiles = handler.generate_player_profiles(data=get_data())
+
+    assert [profile.character_name for profile in profiles] == ["porige", "veganheals"]
+    assert handler.summary.failures[0].character_name == "erod"
+    assert "mythic_plus_scores.all" in handler.summary.failures[0].reason
+
+    # As are successful responses whose body isn't valid JSON at all (e.g., cut short by a proxy).
+    stub_io_server.payloads["erod"] = json.dumps(mock_io_data()).encode()[:100]
+    profiles = handler.generate_player_profiles(data=get_data())
+
+    assert [profile.character_name for profile in profiles] == ["porige", "veganheals"]
+    assert handler.summary.failures[0].character_name == "erod"
+    assert handler.summary.failures[0].status_code == 200
+
+
+def test_import_from_dump(tmp_path) -> None:
+
+    dump_path = tmp_path.joinpath("dump.ndjson")
+    with open(dump_path, "w") as f:
+        for name, realm, score in [("Someone", "Frostmourne", 1.0), ("Erod", "Frostmourne", 2.0), ("", "", 0.0)]:
+            f.write(json.dumps(dict(mock_io_data(), name=name, realm=realm, mythic_plus_scores={"all": score})) + "\n")
+        f.write("\n")
+        f.write(json.dumps(mock_io_data()) + "\n")
+        # Invalid lines, one that can't be matched to a character and one for a character in the roster.
+        f.write("{not json\n")
+        f.write(json.dumps(dict(mock_io_data(), name="Porige", realm="Frostmourne", mythic_plus_scores="high")) + "\n")
+        # Lines of characters that aren't in the roster aren't validated.
+        f.write(json.dumps(dict(mock_io_data(), name="Someone Else", mythic_plus_scores="high")) + "\n")
+
+    cache = ResponseCache(tmp_path.joinpath("responses.sqlite"), ttl=60.0)
+    handler = ProfileHandler(base_url="http://127.0.0.1:9/", cache=cache)
+    profiles = handler.import_player_profiles(str(dump_path), data=get_data())
+
+    # Porige's line of the dump is invalid.
+    assert [(profile.character_name, profile.score) for profile in profiles] == [("veganheals", 925.6), ("erod", 2.0)]
+    assert [failure.character_name for failure in handler.summary.failures] == ["porige"]
+    assert [line.split(": ")[0] for line in handler.summary.invalid_lines] == [f"{dump_path}:6", f"{dump_path}:7"]
+    assert handler.summary.number_invalid_lines == 2
+
+    # Only the first few invalid lines are kept, however many there are.
+    with open(dump_path, "a") as f:
+        f.write("{not json\n" * (2 * MAX_REPORTED_INVALID_LINES))
+    handler.import_player_profiles(str(dump_path), data=get_data())
+    assert handler.summary.number_invalid_lines == 2 + 2 * MAX_REPORTED_INVALID_LINES
+    assert len(handler.summary.invalid_lines) == MAX_REPORTED_INVALID_LINES
+
+    # The imported responses can be used offline.
+    offline_handler = ProfileHandler(cache=cache, offline=True)
+    assert len(offline_handler.generate_player_profiles(data=get_data())) == 2
+
+
+def test_instrumentation(stub_io_server, tmp_path) -> None:
+
+    stub_io_server.default_payload = mock_io_data()
+    stub_io_server.scripted["erod"] = [(503, {}, {"message": "Busy"})]
+
+    instrumentation = Instrumentation()
+    retry_policy = RetryPolicy(backoff_base=0.0)
+    cache = ResponseCache(tmp_path.joinpath("responses.sqlite"), ttl=60.0)
+    handler = ProfileHandler(
+        base_url=stub_io_server.base_url,
+        cache=cache,
+        rate_limit=None,
+        retry_policy=retry_policy,
+        instrumentation=instrumentation,
+    )
+    handler.generate_player_profiles(data=get_data())
+    handler.generate_player_profiles(data=get_data())
+
+    report = instrumentation.report()
+    assert report["spans"]["fetch.character"]["count"] == 6
+    assert report["spans"]["fetch.http"]["count"] == 4
+    assert report["spans"]["fetch.decode"]["count"] == 3
+    assert report["spans"]["profile.format"]["count"] == 6
+    assert sum(report["spans"]["fetch.character"]["histogram"]) == 6
+    assert report["counters"] == {"cache.misses": 3, "cache.hits": 3, "fetch.retries": 1, "fetch.failures": 0}
+
+    instrumentation.save_report(tmp_path.joinpath("report.json"))
+    assert json.loads(tmp_path.joinpath("report.json").read_text())["counters"]["cache.hits"] == 3
+
+    # Nothing is recorded by default.
+    ProfileHandler(base_url=stub_io_server.base_url, rate_limit=None).generate_player_profiles(data=get_data())
+    assert NULL_INSTRUMENTATION.report() == {"spans": {}, "counters": {}, "histogram_buckets": HISTOGRAM_BUCKETS}
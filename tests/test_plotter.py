@@ -1,5 +1,21 @@
+import dataclasses
+import os
+import unittest.mock
+
+import io_comparison.settings as settings
+from io_comparison.icons import IconStore
+from io_comparison.instrumentation import Instrumentation
+from io_comparison.player_profile import Difficulty, Progression
+import io_comparison.plot as plot_module
 from io_comparison.plot import Plotter
+from io_comparison.plot_helper import generate_plot_helper
+from io_comparison.profile_table import ProfileTable
+from io_comparison.render_cache import RenderCache
+from io_comparison.utils import get_class_spec_inds
+from sample_data import get_profiles
 
+import matplotlib.pyplot as plt
+import numpy as np
 import unittest
 import pytest
 
@@ -10,3 +26,246 @@ class TestPlotter(unittest.TestCase):
 
     def test_load(self) -> None:
         plotter = self.get_class()
+
+
+def test_icons_are_decoded_lazily() -> None:
+
+    icons = IconStore()
+    plotter = Plotter(icons=icons)
+    assert ("druid", "feral") not in icons
+
+    icon = icons[("druid", "feral")]
+    assert icon.shape == (56, 56, 3)
+    assert icons[("druid", "feral")] is icon
+    assert ("druid", None) not in icons
+
+
+def test_icon_atlas_round_trip(tmp_path) -> None:
+
+    atlas_path = IconStore().build_atlas(tmp_path.joinpath("atlas.npy"), names=["druid", "druid_feral", "raider_io"])
+    atlas_icons = IconStore(atlas_path=atlas_path)
+    decoded_icons = IconStore()
+
+    for key in [("druid", None), ("druid", "feral"), "raider_io"]:
+        assert atlas_icons[key].dtype == decoded_icons[key].dtype
+        np.testing.assert_array_equal(atlas_icons[key], decoded_icons[key])
+
+
+def test_placements(tmp_path) -> None:
+
+    profiles = get_profiles()
+    plotter = Plotter(plot_helper=generate_plot_helper(output_path=f"{tmp_path}/"))
+    placements = plotter.get_placements(profiles)
+
+    for profile, (x, y) in zip(profiles, placements):
+        inds_info = get_class_spec_inds(profile.class_, profile.spec)
+        assert x == pytest.approx(settings.IMAGE_SIZE * inds_info.global_idx / inds_info.num_global)
+        assert y == pytest.approx(settings.IMAGE_SIZE * profile.score / settings.MAX_IO)
+
+    np.testing.assert_array_equal(plotter.plot_profiles(profiles, "placements"), placements)
+
+
+def _rasterize(draw) -> np.ndarray:
+
+    fig, ax = plt.subplots(figsize=Plotter._FIGSIZE)
+    ax.set_xlim(0, settings.IMAGE_SIZE)
+    ax.set_ylim(0, settings.IMAGE_SIZE)
+    ax.set_axis_off()
+    draw(ax)
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba())[..., :3] / 255
+    plt.close(fig)
+    return image
+
+
+def test_profile_artists() -> None:
+
+    table = ProfileTable.from_profiles(get_profiles(), raid=settings.CURRENT_RAID)
+    plotter = Plotter()
+    coords = plotter.get_placements(table)
+    icon_width, icon_height = Plotter._ICON_SIZE
+
+    fig, ax = plt.subplots()
+    plotter._add_bars(table, coords, ax)
+    plotter._add_progressions(table, coords, ax)
+    plotter._add_icons(table, coords, ax)
+
+    # One collection each for the bars and progression boxes, with a rectangle per profile, and a label per profile.
+    bars, boxes = ax.collections
+    assert len(bars.get_paths()) == len(boxes.get_paths()) == len(ax.texts) == len(table)
+    for bar, box, (x, y) in zip(bars.get_paths(), boxes.get_paths(), coords):
+        np.testing.assert_allclose(bar.vertices[:4].min(axis=0), [x + icon_width / 4, 0])
+        np.testing.assert_allclose(bar.vertices[:4].max(axis=0), [x + icon_width * 3 / 4, y])
+        np.testing.assert_allclose(box.vertices[:4].min(axis=0), [x - icon_width * 0.16, y - icon_height * 0.155])
+
+    # A single image holding every icon, spanning only the region they occupy.
+    (layer,) = ax.images
+    x_low, x_high, y_low, y_high = layer.get_extent()
+    assert (x_low, y_low) == pytest.approx(tuple(coords.min(axis=0)), abs=1)
+    assert (x_high, y_high) == pytest.approx(tuple(coords.max(axis=0) + [icon_width, icon_height]), abs=1)
+    plt.close(fig)
+
+    # The icon layer is resampled, so it isn't pixel identical to drawing an image per icon, but only differs around
+    # the edges of the icons.
+    def draw_per_icon(ax) -> None:
+        for key, (x, y) in zip(table.get_class_specs(), coords):
+            ax.imshow(plotter._icons[key], extent=[x, x + icon_width, y, y + icon_height], zorder=4)
+
+    layer_image = _rasterize(lambda ax: plotter._add_icons(table, coords, ax))
+    per_icon_image = _rasterize(draw_per_icon)
+
+    layer_mask = (layer_image != 1).any(axis=-1)
+    per_icon_mask = (per_icon_image != 1).any(axis=-1)
+    assert (layer_mask & per_icon_mask).sum() / (layer_mask | per_icon_mask).sum() > 0.95
+    assert np.abs(layer_image - per_icon_image)[layer_mask | per_icon_mask].mean() < 0.1
+
+
+def test_legend_labels() -> None:
+
+    plotter = Plotter()
+    profiles = get_profiles()
+    heroic = Progression(number_killed=4, number_bosses=10, difficulty=Difficulty.H)
+    heroic_profiles = [dataclasses.replace(profile, progression={"castle-nathria": heroic}) for profile in profiles]
+
+    # Labelled with the difficulty of the progression shown, rather than always mythic.
+    for plot_profiles, difficulty in [(profiles, "M"), (heroic_profiles, "H")]:
+        table = ProfileTable.from_profiles(plot_profiles, raid="castle-nathria")
+        fig, ax = plt.subplots()
+        plotter._add_legend(ax, plotter._get_number_bosses(table), table.get_hardest_difficulty())
+        labels = [text.get_text() for text in ax.get_legend().get_texts()]
+        assert labels[0] == f"<5/10{difficulty}"
+        assert all(label.endswith(f"/10{difficulty}") for label in labels)
+        plt.close(fig)
+
+    # An unknown raid nobody has progressed in has no boss count to label.
+    table = ProfileTable.from_profiles(profiles, raid="unknown-raid")
+    fig, ax = plt.subplots()
+    plotter._add_legend(ax, plotter._get_number_bosses(table), table.get_hardest_difficulty())
+    assert ax.get_legend() is None
+    plt.close(fig)
+
+
+def test_plotting_several_raids(tmp_path) -> None:
+
+    profiles = get_profiles()
+    plotter = Plotter(plot_helper=generate_plot_helper(output_path=f"{tmp_path}/"))
+
+    plotter.plot_profiles(profiles, "castle-nathria", raid="castle-nathria")
+    plotter.plot_profiles(profiles, "sanctum-of-domination", raid="sanctum-of-domination")
+
+    assert tmp_path.joinpath("castle-nathria.png").exists()
+    assert tmp_path.joinpath("sanctum-of-domination.png").exists()
+
+
+def test_plotting_table_of_other_raid(tmp_path) -> None:
+
+    table = ProfileTable.from_profiles(get_profiles(), raid="castle-nathria")
+    plotter = Plotter(plot_helper=generate_plot_helper(output_path=f"{tmp_path}/"))
+
+    with pytest.raises(ValueError):
+        plotter.plot_profiles(table, "mismatch", raid="sanctum-of-domination")
+
+
+def test_render_cache(tmp_path) -> None:
+
+    render_cache = RenderCache(tmp_path.joinpath("renders"))
+    plotter = Plotter(plot_helper=generate_plot_helper(output_path=f"{tmp_path}/"), render_cache=render_cache)
+    profiles = get_profiles()
+
+    plotter.plot_profiles(profiles, "first")
+    assert len(render_cache) == 1
+
+    # Identical inputs are copied from the cache rather than rendered.
+    with unittest.mock.patch.object(plotter, "_add_icons") as add_icons:
+        placements = plotter.plot_profiles(profiles, "second")
+    add_icons.assert_not_called()
+    assert tmp_path.joinpath("second.png").read_bytes() == tmp_path.joinpath("first.png").read_bytes()
+    assert placements.shape == (len(profiles), 2)
+
+    # Plots are copies, so editing one leaves the cached render (and later reuses of it) intact.
+    rendered = tmp_path.joinpath("first.png").read_bytes()
+    tmp_path.joinpath("first.png").write_bytes(b"edited")
+    tmp_path.joinpath("second.png").write_bytes(b"edited")
+    plotter.plot_profiles(profiles, "third")
+    assert tmp_path.joinpath("third.png").read_bytes() == rendered
+
+    # Anything that's drawn changes the key; anything that isn't doesn't.
+    table = ProfileTable.from_profiles(profiles)
+    key = plotter.get_render_key(table)
+    assert plotter.get_render_key(table, background_image=np.zeros((2, 2, 3))) != key
+    assert plotter.get_render_key(table.sort_by_score()) != key
+    renamed = [dataclasses.replace(profile, guild="Elsewhere") for profile in profiles]
+    assert plotter.get_render_key(ProfileTable.from_profiles(renamed)) == key
+
+    # The background is hashed once for as long as it's alive, and the same digest is used for the template.
+    background = np.zeros((2, 2, 3))
+    with_background = plotter.get_render_key(table, background_image=background)
+    with unittest.mock.patch("io_comparison.plot._update_digest", wraps=plot_module._update_digest) as update_digest:
+        assert plotter.get_render_key(table, background_image=background) == with_background
+    assert all(call.args[1] is not background for call in update_digest.call_args_list)
+
+
+def test_render_cache_eviction(tmp_path) -> None:
+
+    render_cache = RenderCache(tmp_path, max_age=None, max_bytes=10)
+    for idx, key in enumerate(["a", "b", "c"]):
+        rendered_file = tmp_path.joinpath(f"rendered_{key}")
+        rendered_file.write_bytes(b"0123")
+        render_cache.set(key, "png", rendered_file)
+        rendered_file.unlink()
+        os.utime(render_cache.get(key, "png"), (idx, idx))
+
+    render_cache.set("d", "png", render_cache.get("c", "png"))
+
+    # Only the most recently used entries that fit in 10 bytes remain.
+    assert render_cache.get("a", "png") is None
+    assert render_cache.get("b", "png") is None
+    assert render_cache.get("c", "png") is not None
+    assert render_cache.get("d", "png") is not None
+
+
+def test_plot_instrumentation(tmp_path) -> None:
+
+    instrumentation = Instrumentation()
+    plotter = Plotter(plot_helper=generate_plot_helper(output_path=f"{tmp_path}/"), instrumentation=instrumentation)
+    plotter.plot_profiles(get_profiles(), "instrumented")
+
+    spans = instrumentation.report()["spans"]
+    for name in ["plot.table", "plot.artists.icons", "plot.artists.bars", "plot.artists.progressions", "plot.savefig"]:
+        assert spans[name]["count"] == 1
+    assert spans["plot.icons.load"]["count"] >= 1
+
+
+def test_figure_template(tmp_path) -> None:
+
+    plot_helper = generate_plot_helper(output_path=f"{tmp_path}/")
+    template_plotter = Plotter(plot_helper=plot_helper)
+    full_plotter = Plotter(plot_helper=plot_helper, reuse_figures=False)
+
+    profiles = get_profiles()
+    background = np.linspace(0, 1, 16 * 16 * 3).reshape(16, 16, 3)
+    # Including an empty roster without a background, where nothing else makes the aspect equal.
+    plots = [(profiles, None), (profiles[:-1], None), ([], None), (profiles, background)]
+
+    # Plots drawn onto a reused template, with the previous plot's profiles removed, match plots drawn in full.
+    for idx, (plot_profiles, background_image) in enumerate(plots):
+        template_plotter.plot_profiles(plot_profiles, f"template_{idx}", background_image)
+        full_plotter.plot_profiles(plot_profiles, f"full_{idx}", background_image)
+
+        template_image = plt.imread(tmp_path.joinpath(f"template_{idx}.png"))
+        full_image = plt.imread(tmp_path.joinpath(f"full_{idx}.png"))
+        np.testing.assert_array_equal(template_image, full_image)
+
+    # Only the template of the latest background is kept, until it's freed.
+    assert len(template_plotter._templates) == 1
+    with unittest.mock.patch.object(template_plotter, "_build_template") as build_template:
+        template_plotter.plot_profiles(profiles, "template_again", background)
+    build_template.assert_not_called()
+    assert not full_plotter._templates
+
+    template_plotter.clear_templates()
+    assert not template_plotter._templates
+    template_plotter.plot_profiles(profiles, "template_rebuilt", background)
+    np.testing.assert_array_equal(
+        plt.imread(tmp_path.joinpath("template_rebuilt.png")), plt.imread(tmp_path.joinpath("full_3.png"))
+    )
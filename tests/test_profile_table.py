@@ -0,0 +1,41 @@
+import numpy as np
+
+from io_comparison.plot import Plotter
+from io_comparison.plot_helper import generate_plot_helper
+from io_comparison.profile_table import ProfileTable
+from sample_data import get_profiles
+
+
+def test_round_trip() -> None:
+
+    profiles = get_profiles()
+    table = ProfileTable.from_profiles(profiles, raid="castle-nathria")
+
+    assert len(table) == 3
+    assert table.get_class_specs() == [("priest", "holy"), ("paladin", "holy"), ("priest", "shadow")]
+    assert table.get_player_strings() == [profile.get_player_string() for profile in profiles]
+    np.testing.assert_allclose(table.get_progression_fraction(), [0.2, 1.0, 0.0])
+
+    # Realms are interned rather than stored per row.
+    assert len(table._string_pools["character_realm"]) == 2
+
+    assert table.to_profiles() == profiles
+
+
+def test_sort_and_filter() -> None:
+
+    table = ProfileTable.from_profiles(get_profiles())
+
+    by_score = table.sort_by_score()
+    assert by_score.get_strings("character_name") == ["porige", "erod", "veganheals"]
+
+    priests = table.take(np.array(table.get_classes()) == "priest")
+    assert priests.get_strings("character_name") == ["veganheals", "erod"]
+
+
+def test_plotting_table(tmp_path) -> None:
+
+    plotter = Plotter(plot_helper=generate_plot_helper(output_path=f"{tmp_path}/"))
+    plotter.plot_profiles(ProfileTable.from_profiles(get_profiles()), "table")
+
+    assert tmp_path.joinpath("table.png").exists()
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from io_comparison.settings import CLASS_COLORS, CLASSES_SPECS
+from io_comparison.utils import (
+    CLASS_STYLE_TABLE,
+    build_class_spec_inds,
+    get_class_spec_inds,
+    get_global_x_positions,
+    get_text_color,
+    hex_to_rgb,
+)
+
+
+def test_class_spec_inds() -> None:
+
+    inds_info = get_class_spec_inds("priest", "holy")
+    assert inds_info.class_idx == 7
+    assert inds_info.spec_idx == 1
+    assert inds_info.num_specs == 3
+    assert inds_info.global_idx == 22
+    assert inds_info.num_global == sum(len(specs) for specs in CLASSES_SPECS.values())
+
+    # The same spec name on a different class has a different global index.
+    assert get_class_spec_inds("paladin", "holy").global_idx == 18
+
+    # The table is shared and immutable.
+    assert build_class_spec_inds() is build_class_spec_inds()
+    with pytest.raises(TypeError):
+        build_class_spec_inds()["priest"]["holy"] = inds_info
+
+
+def test_global_x_positions() -> None:
+
+    classes = ["priest", "paladin", "death_knight", "warrior"]
+    specs = ["holy", "holy", "blood", "protection"]
+
+    expected = [get_class_spec_inds(c, s).global_idx / get_class_spec_inds(c, s).num_global for c, s in zip(classes, specs)]
+    np.testing.assert_allclose(get_global_x_positions(classes, specs), expected)
+
+    with pytest.raises(KeyError):
+        get_global_x_positions(["priest"], ["fury"])
+
+
+def test_text_color() -> None:
+
+    assert hex_to_rgb("#C41E3A") == (196, 30, 58)
+    assert hex_to_rgb("#FFF") == (255, 255, 255)
+    with pytest.raises(ValueError):
+        hex_to_rgb("#12345")
+
+    # Dark text on bright backgrounds and vice versa.
+    assert get_text_color("#FFFFFF") == ("#000000", "#FFFFFF")
+    assert get_text_color("#0070DD") == ("#FFFFFF", "#000000")
+
+
+def test_class_style_table() -> None:
+
+    assert set(CLASS_STYLE_TABLE) == set(CLASS_COLORS)
+    for class_, color in CLASS_COLORS.items():
+        style = CLASS_STYLE_TABLE[class_]
+        assert style.color == color
+        assert (style.text_color, style.outline_color) == get_text_color(color)
+
+    with pytest.raises(TypeError):
+        CLASS_STYLE_TABLE["priest"] = CLASS_STYLE_TABLE["mage"]